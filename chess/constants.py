@@ -6,6 +6,13 @@ PIECE_UNICODE = {
     'p': '♟', 'n': '♞', 'b': '♝', 'r': '♜', 'q': '♛', 'k': '♚',
 }
 
+# Same glyphs indexed by piece_type (+6 for black); index 0 is an empty square
+UNICODE_BY_PT = (
+    None,
+    '♙', '♘', '♗', '♖', '♕', '♔',
+    '♟', '♞', '♝', '♜', '♛', '♚',
+)
+
 # Board colors - Light theme
 LIGHT_COLOR = '#F0D9B5'
 DARK_COLOR = '#B58863'
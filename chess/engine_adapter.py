@@ -59,6 +59,17 @@ class EngineAdapter:
     def verify(self, path: str, **kwargs):
         return self._mgr.verify_engine(path, **kwargs)
 
+    def verify_attempt(self, path: str, timeout: float = 0.05, probe: bool = True):
+        """Single verification attempt; returns (ok, message)."""
+        return self._mgr.verify_attempt(path, timeout, probe=probe)
+
+    def probe_identity_async(self, path: str):
+        """Future resolving to the engine's 'name by author' string."""
+        return self._mgr.probe_identity_async(path)
+
+    def backoff_schedule(self, retries: int, backoff: str = 'linear', max_wait: float = 5.0) -> list:
+        return self._mgr.backoff_schedule(retries, backoff, max_wait)
+
     def download_stockfish(self, prefer_platform: str = 'auto', token: str = ''):
         """Download Stockfish via underlying manager.
 
@@ -1,18 +1,119 @@
+import concurrent.futures
 import os
 import shutil
-import urllib.request
-import json
-import zipfile
-import tempfile
 import platform
-import subprocess
+import threading
+import random
+import re
 import time
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 
 import chess
 import chess.engine
 
 DEFAULT_REPO_API = 'https://api.github.com/repos/official-stockfish/Stockfish/releases/latest'
+RELEASE_CACHE_NAME = '.release_cache.json'
+# Records which release asset the binary in engines/ came from
+INSTALLED_ASSET_NAME = '.installed_asset.json'
+
+# Release asset name patterns per platform (zip archives only)
+_ASSET_PATTERNS = {
+    'windows': re.compile(r'(win|windows).*\.zip$'),
+    'macos': re.compile(r'(mac|osx|macos).*\.zip$'),
+    'linux': re.compile(r'linux.*\.zip$'),
+}
+
+# UCI options applied when an engine is spawned; one thread so the engine does
+# not compete with the GUI and SimpleAI workers for cores
+ENGINE_OPTIONS = {'Hash': 64, 'Threads': 1}
+
+# Stockfish build tags in order of preference when the CPU supports them;
+# each entry is (tag in the asset file name, /proc/cpuinfo flags it needs)
+_CPU_BUILDS = (
+    ('avx512', ('avx512f', 'avx512bw')),
+    ('bmi2', ('bmi2',)),
+    ('avx2', ('avx2',)),
+    ('sse41-popcnt', ('sse4_1', 'popcnt')),
+    ('modern', ('popcnt',)),
+    ('popcnt', ('popcnt',)),
+)
+_DOC_SUFFIXES = ('.txt', '.md', '.nnue', '.pdf', '.html', '.sh', '.bat')
+
+
+def _cpu_flags() -> Optional[set]:
+    """CPU feature flags from /proc/cpuinfo, or None where they can't be read."""
+    try:
+        with open('/proc/cpuinfo', encoding='utf-8', errors='ignore') as f:
+            for line in f:
+                if line.startswith('flags'):
+                    return set(line.split(':', 1)[1].split())
+    except OSError:
+        pass
+    return None
+
+
+def _build_rank(name: str, flags: Optional[set]) -> Optional[int]:
+    """Preference rank of a Stockfish build by its file name (lower is better).
+
+    None means the host can't run it: a CPU tag the flags don't cover, or,
+    with unknown flags, anything above the baseline popcnt builds.
+    """
+    for i, (tag, needs) in enumerate(_CPU_BUILDS):
+        if tag in name:
+            if flags is None:
+                return i if tag in ('sse41-popcnt', 'modern', 'popcnt') else None
+            return i if all(f in flags for f in needs) else None
+    return len(_CPU_BUILDS)  # untagged/generic build
+
+
+def _is_arm_build(name: str) -> bool:
+    return any(t in name for t in ('arm', 'aarch64', 'apple-silicon', 'm1'))
+
+
+def _pick_engine_member(names, windows: bool, flags: Optional[set]) -> Optional[str]:
+    """Choose the one engine binary to extract from a release archive's file list."""
+    arm = platform.machine().lower() in ('arm64', 'aarch64')
+    best = None
+    best_rank = None
+    for name in names:
+        base = name.rsplit('/', 1)[-1].lower()
+        if not base.startswith('stockfish') or name.endswith('/') or base.endswith(_DOC_SUFFIXES):
+            continue
+        if windows != base.endswith('.exe') or arm != _is_arm_build(base):
+            continue
+        rank = _build_rank(base, flags)
+        if rank is not None and (best_rank is None or rank < best_rank):
+            best, best_rank = name, rank
+    return best
+
+
+def _pick_release_asset(assets, prefer_platform: str, flags: Optional[set]) -> Optional[dict]:
+    """Best downloadable zip asset in one pass: platform match first, then CPU build rank."""
+    pattern = _ASSET_PATTERNS.get(prefer_platform)
+    arm = platform.machine().lower() in ('arm64', 'aarch64')
+
+    def score(a):
+        name = a.get('name', '').lower()
+        rank = _build_rank(name, flags)
+        return (bool(pattern and pattern.search(name)), arm == _is_arm_build(name),
+                rank is not None, -(rank or 0))
+    zips = [a for a in assets if a.get('browser_download_url') and a.get('name', '').lower().endswith('.zip')]
+    return max(zips, key=score, default=None)
+
+
+# Multiplier of the base backoff for attempt n (1-based), per strategy
+_BACKOFF_STEPS = {
+    'constant': lambda n: 1,
+    'exponential': lambda n: 1 << (n - 1),
+    'linear': lambda n: n,
+}
+
+
+def _format_identity(name: Optional[str], author: Optional[str]) -> str:
+    """'<name> by <author>', dropping whichever part is missing."""
+    if name and author:
+        return f'{name} by {author}'
+    return name or (f'by {author}' if author else '')
 
 
 class EngineManager:
@@ -22,6 +123,14 @@ class EngineManager:
         os.makedirs(self.engines_dir, exist_ok=True)
         self.engine: Optional[chess.engine.SimpleEngine] = None
         self.path: Optional[str] = None
+        # Verify attempts and AI moves run on different worker threads but share one engine
+        self._lock = threading.RLock()
+        # Path whose running engine already completed a verification play
+        self._verified_path: Optional[str] = None
+        # Identity probes wait on a child pipe; run them off the caller's thread
+        self._probe_pool = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+        # (path, mtime, size) -> identity; a re-downloaded binary changes the key
+        self._identity_cache: Dict[Tuple[str, float, int], str] = {}
 
     def detect(self) -> Optional[str]:
         # check engines/ folder first
@@ -40,65 +149,143 @@ class EngineManager:
             return p
         return None
 
-    def start(self, path: str) -> bool:
-        """Start engine process and keep reference. Returns True on success."""
-        try:
+    def _get_or_start_engine(self, path: str) -> chess.engine.SimpleEngine:
+        """Return the running engine for path, spawning it only if needed."""
+        with self._lock:
+            if self.engine is not None and self.path == path:
+                return self.engine
             self.stop()
             eng = chess.engine.SimpleEngine.popen_uci(path)
+            try:
+                eng.configure({k: v for k, v in ENGINE_OPTIONS.items() if k in eng.options})
+            except Exception:
+                pass
             self.engine = eng
             self.path = path
+            return eng
+
+    def start(self, path: str) -> bool:
+        """Start engine process and keep reference. Returns True on success.
+
+        An engine already running for the same path (e.g. after Verify) is reused.
+        """
+        try:
+            self._get_or_start_engine(path)
             return True
         except Exception:
             self.engine = None
             return False
 
     def stop(self):
-        try:
-            if self.engine:
-                try:
-                    self.engine.quit()
-                except Exception:
-                    pass
-        finally:
-            self.engine = None
-            self.path = None
+        with self._lock:
+            try:
+                if self.engine:
+                    try:
+                        self.engine.quit()
+                    except Exception:
+                        pass
+            finally:
+                self.engine = None
+                self.path = None
+                self._verified_path = None
 
     def play(self, board: chess.Board, limit: chess.engine.Limit):
-        if not self.engine:
-            raise RuntimeError('Engine not started')
-        return self.engine.play(board, limit)
+        with self._lock:
+            if not self.engine:
+                raise RuntimeError('Engine not started')
+            return self.engine.play(board, limit)
+
+    def probe_identity_async(self, path: str) -> 'concurrent.futures.Future':
+        """Submit probe_identity to the worker pool; the Future yields the identity string."""
+        return self._probe_pool.submit(self.probe_identity, path)
 
     def probe_identity(self, path: str) -> str:
         try:
-            proc = subprocess.Popen([path], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            out, err = proc.communicate('uci\nquit\n', timeout=5)
-            name = None
-            author = None
-            for line in out.splitlines():
-                line = line.strip()
-                if line.lower().startswith('id name'):
-                    name = line[7:].strip()
-                elif line.lower().startswith('id author'):
-                    author = line[9:].strip()
-            parts = []
-            if name:
-                parts.append(name)
-            if author:
-                parts.append(f'by {author}')
-            return ' '.join(parts)
+            real = shutil.which(path) or path
+            key = (real, os.path.getmtime(real), os.path.getsize(real))
+        except OSError:
+            return ''
+        cached = self._identity_cache.get(key)
+        if cached is not None:
+            return cached
+        ident = self._running_identity(path) or self._probe_identity_uncached(path)
+        if ident:
+            self._identity_cache[key] = ident
+        return ident
+
+    @staticmethod
+    def _engine_identity(eng: chess.engine.SimpleEngine) -> str:
+        """Identity from an engine's UCI handshake ('id name' / 'id author')."""
+        try:
+            ids = getattr(eng, 'id', None) or {}
+            return _format_identity(ids.get('name'), ids.get('author'))
         except Exception:
             return ''
 
-    def download_stockfish(self, prefer_platform: str = 'auto', token: str = '') -> str:
-        headers = {'Accept': 'application/vnd.github.v3+json'}
-        if token:
-            headers['Authorization'] = f'token {token}'
+    def _running_identity(self, path: str) -> str:
+        """Identity from the already-running engine's UCI handshake, if it is for path."""
+        eng = self.engine
+        if eng is None or self.path != path:
+            return ''
+        return self._engine_identity(eng)
+
+    def _probe_identity_uncached(self, path: str, timeout: float = 2.0) -> str:
+        """Handshake with a short-lived engine for path (used when it is not the running one)."""
         try:
-            req = urllib.request.Request(DEFAULT_REPO_API, headers=headers)
+            eng = chess.engine.SimpleEngine.popen_uci(path, timeout=timeout)
+        except Exception:
+            return ''
+        try:
+            return self._engine_identity(eng)
+        finally:
+            try:
+                eng.quit()
+            except Exception:
+                pass
+
+    def _fetch_release(self, headers: dict) -> Optional[dict]:
+        """Fetch the latest release JSON, revalidating the on-disk copy by ETag.
+
+        A 304 reply reuses the cached body, so repeated clicks do not burn
+        the (rate-limited) GitHub API quota.
+        """
+        import json, urllib.error, urllib.request
+        cache_path = os.path.join(self.engines_dir, RELEASE_CACHE_NAME)
+        cached = None
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except Exception:
+            cached = None
+        req_headers = dict(headers)
+        if isinstance(cached, dict) and cached.get('etag'):
+            req_headers['If-None-Match'] = cached['etag']
+        try:
+            req = urllib.request.Request(DEFAULT_REPO_API, headers=req_headers)
             with urllib.request.urlopen(req, timeout=15) as resp:
                 data = json.load(resp)
+                etag = resp.headers.get('ETag')
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and isinstance(cached, dict):
+                return cached.get('json')
+            return None
         except Exception:
-            return ''
+            return None
+        if etag:
+            try:
+                with open(cache_path, 'w', encoding='utf-8') as f:
+                    json.dump({'etag': etag, 'json': data, 'ts': int(time.time())}, f)
+            except Exception:
+                pass
+        return data
+
+    def download_stockfish(self, prefer_platform: str = 'auto', token: str = '') -> str:
+        # Network/archive modules are only needed here; keep them off the startup path
+        import io, urllib.request, zipfile
+        headers = {'Accept': 'application/vnd.github.v3+json'}
+        if token:
+            headers['Authorization'] = f'token {token}'
+        data = self._fetch_release(headers)
 
         assets = data.get('assets', []) if isinstance(data, dict) else []
         if not assets:
@@ -113,67 +300,46 @@ class EngineManager:
             else:
                 prefer_platform = 'linux'
 
-        candidate = None
-        candidate_name = None
-        for a in assets:
-            name = a.get('name', '').lower()
-            url = a.get('browser_download_url')
-            if not url:
-                continue
-            if prefer_platform == 'windows' and ('win' in name or 'windows' in name) and name.endswith('.zip'):
-                candidate = url
-                candidate_name = name
-                break
-            if prefer_platform == 'macos' and ('mac' in name or 'osx' in name or 'macos' in name) and name.endswith('.zip'):
-                candidate = url
-                candidate_name = name
-                break
-            if prefer_platform == 'linux' and ('linux' in name) and name.endswith('.zip'):
-                candidate = url
-                candidate_name = name
-                break
-
-        if not candidate:
-            for a in assets:
-                name = a.get('name', '').lower()
-                url = a.get('browser_download_url')
-                if name.endswith('.zip'):
-                    candidate = url
-                    candidate_name = name
-                    break
-
+        flags = _cpu_flags()
+        asset = _pick_release_asset(assets, prefer_platform, flags)
+        candidate = asset.get('browser_download_url') if asset else None
         if not candidate:
             return ''
 
+        # Same asset (name, upload time, size) already installed: skip the download
+        import json
+        stamp = [asset.get('name'), asset.get('updated_at'), asset.get('size')]
+        marker = os.path.join(self.engines_dir, INSTALLED_ASSET_NAME)
         try:
-            tmpf = tempfile.NamedTemporaryFile(delete=False)
-            tmp_path = tmpf.name
-            tmpf.close()
-            req = urllib.request.Request(candidate, headers=headers)
-            with urllib.request.urlopen(req, timeout=60) as resp, open(tmp_path, 'wb') as out:
-                shutil.copyfileobj(resp, out)
-            with zipfile.ZipFile(tmp_path, 'r') as z:
-                z.extractall(self.engines_dir)
-            os.unlink(tmp_path)
+            with open(marker, 'r', encoding='utf-8') as f:
+                installed = json.load(f)
+            if installed.get('asset') == stamp and os.path.isfile(installed.get('path', '')):
+                return installed['path']
+        except Exception:
+            pass
 
-            exe_name = 'stockfish'
-            if platform.system().lower().startswith('windows'):
-                exe_name = 'stockfish.exe'
+        try:
+            # Keep the archive in memory and stream out only the one binary that suits
+            # this OS/CPU, skipping sources, docs and the other CPU builds
+            buf = io.BytesIO()
+            req = urllib.request.Request(candidate, headers=headers)
+            with urllib.request.urlopen(req, timeout=60) as resp:
+                shutil.copyfileobj(resp, buf)
+            buf.seek(0)
 
+            windows = platform.system().lower().startswith('windows')
+            exe_name = 'stockfish.exe' if windows else 'stockfish'
+            dest = os.path.join(self.engines_dir, exe_name)
             found = ''
-            for root, dirs, files in os.walk(self.engines_dir):
-                for f in files:
-                    if f.lower().startswith('stockfish'):
-                        candidate_path = os.path.join(root, f)
-                        dest = os.path.join(self.engines_dir, exe_name)
-                        try:
-                            shutil.copyfile(candidate_path, dest)
-                            found = dest
-                            break
-                        except Exception:
-                            continue
-                if found:
-                    break
+            with zipfile.ZipFile(buf) as z:
+                member = _pick_engine_member(z.namelist(), windows, flags)
+                if member:
+                    if os.path.isdir(dest):
+                        # An older extraction's folder owns the name; keep the build's own name
+                        dest = os.path.join(self.engines_dir, os.path.basename(member))
+                    with z.open(member) as src, open(dest, 'wb') as dst:
+                        shutil.copyfileobj(src, dst, 1 << 20)
+                    found = dest
 
             if not found:
                 return ''
@@ -181,37 +347,91 @@ class EngineManager:
                 os.chmod(found, 0o755)
             except Exception:
                 pass
+            try:
+                with open(marker, 'w', encoding='utf-8') as f:
+                    json.dump({'asset': stamp, 'path': found}, f)
+            except Exception:
+                pass
             return found
         except Exception:
             return ''
 
+    def verify_attempt(self, path: str, timeout: float = 0.05, probe: bool = True) -> Tuple[bool, str]:
+        """Run a single verification attempt. Returns (ok, message or error).
+
+        With probe=False the identity suffix is left to the caller (see
+        probe_identity_async).
+        """
+        with self._lock:
+            return self._verify_attempt_locked(path, timeout, probe)
+
+    def _verify_attempt_locked(self, path: str, timeout: float, probe: bool) -> Tuple[bool, str]:
+        try:
+            eng = self._get_or_start_engine(path)
+            if self._verified_path == path:
+                # Already proven to play a move; a UCI isready round-trip suffices
+                eng.ping()
+                return True, 'Engine is ready'
+            b = chess.Board()
+            res = eng.play(b, chess.engine.Limit(time=timeout))
+            if res is None or not getattr(res, 'move', None):
+                self.stop()
+                return False, 'Engine started but did not return a move'
+            self._verified_path = path
+            info = self.probe_identity(path) if probe else ''
+            msg = f'Engine responded with move: {res.move}'
+            if info:
+                msg += f' — {info}'
+            return True, msg
+        except Exception as e:
+            # Drop a misbehaving process so the next attempt starts fresh
+            self.stop()
+            return False, str(e)
+
+    @staticmethod
+    def backoff_delay(attempt: int, backoff: str = 'linear', max_wait: float = 5.0, base_backoff: float = 0.5,
+                      prev_wait: Optional[float] = None) -> float:
+        """Seconds to wait after a failed attempt (1-based) for the given strategy.
+
+        Passing the previous wait makes 'exponential' use decorrelated jitter
+        (uniform between base and 3x the previous wait).
+        """
+        if backoff == 'exponential' and prev_wait is not None:
+            return min(max_wait, random.uniform(base_backoff, max(base_backoff, prev_wait) * 3))
+        step = _BACKOFF_STEPS.get(backoff, _BACKOFF_STEPS['linear'])
+        wait = base_backoff * step(attempt)
+        # Small jitter so parallel verifiers do not retry in lockstep
+        return min(max_wait, wait + random.uniform(0, base_backoff * 0.1))
+
+    @classmethod
+    def backoff_schedule(cls, retries: int, backoff: str = 'linear', max_wait: float = 5.0) -> list:
+        """Precompute the waits between retries (length retries - 1)."""
+        waits = []
+        prev_wait = None
+        for attempt in range(1, retries):
+            prev_wait = cls.backoff_delay(attempt, backoff, max_wait, prev_wait=prev_wait)
+            waits.append(prev_wait)
+        return waits
+
     def verify_engine(self, path: Optional[str], retries: int = 2, timeout: float = 0.05, auto_download: bool = False,
                       prefer_platform: str = 'auto', backoff: str = 'linear', max_wait: float = 5.0, token: str = '') -> Tuple[bool, str, Optional[str]]:
-        """Verify engine responds. Returns (ok, message, path)."""
+        """Verify engine responds, blocking between retries. Returns (ok, message, path).
+
+        GUI callers should drive verify_attempt()/backoff_schedule() from the event
+        loop instead so the window is not frozen while waiting.
+        """
         if not path:
             return False, 'No engine path', None
+        # Resolve a bare name once so retries do not rescan PATH
+        path = shutil.which(path) or path
         last_err = ''
         tried_download = False
-        base_backoff = 0.5
+        waits = self.backoff_schedule(max(1, retries), backoff, max_wait)
         for attempt in range(1, max(1, retries) + 1):
-            try:
-                eng = chess.engine.SimpleEngine.popen_uci(path)
-                b = chess.Board()
-                res = eng.play(b, chess.engine.Limit(time=timeout))
-                try:
-                    eng.quit()
-                except Exception:
-                    pass
-                if res is None or not getattr(res, 'move', None):
-                    last_err = 'Engine started but did not return a move'
-                else:
-                    info = self.probe_identity(path)
-                    msg = f'Engine responded with move: {res.move} (attempt {attempt}/{retries})'
-                    if info:
-                        msg += f' — {info}'
-                    return True, msg, path
-            except Exception as e:
-                last_err = str(e)
+            ok, msg = self.verify_attempt(path, timeout)
+            if ok:
+                return True, f'{msg} (attempt {attempt}/{retries})', path
+            last_err = msg
 
             if auto_download and not tried_download:
                 tried_download = True
@@ -220,12 +440,6 @@ class EngineManager:
                     path = found
 
             if attempt < retries:
-                if backoff == 'constant':
-                    wait = min(max_wait, base_backoff)
-                elif backoff == 'exponential':
-                    wait = min(max_wait, base_backoff * (2 ** (attempt - 1)))
-                else:
-                    wait = min(max_wait, base_backoff * attempt)
-                time.sleep(wait)
+                time.sleep(waits[attempt - 1])
 
         return False, f'Engine verification failed after {retries} attempts: {last_err}', None
@@ -3,7 +3,7 @@ import tkinter as tk
 from typing import Callable, Dict, Optional, Tuple
 import chess
 from constants import (
-    PIECE_UNICODE, SQUARE_SIZE, BOARD_SIZE, THEMES, FILES, RANKS,
+    UNICODE_BY_PT, SQUARE_SIZE, BOARD_SIZE, THEMES, FILES, RANKS,
     ANIMATION_FRAMES, ANIMATION_DELAY,
     LIGHT_COLOR, DARK_COLOR, HIGHLIGHT_COLOR, LEGAL_MOVE_COLOR,
     CAPTURE_COLOR, LAST_MOVE_COLOR
@@ -31,13 +31,34 @@ class EnhancedBoardView:
         self.theme = theme
         self.show_coordinates = show_coordinates
         self.flipped = flipped
-        self.canvases: Dict[int, tk.Canvas] = {}
+        # One canvas holds every square: a rectangle per square plus piece items
+        self.canvas: Optional[tk.Canvas] = None
+        self._sq_rect: Dict[int, int] = {}
         self.piece_items: Dict[int, Optional[int]] = {}
+        # Piece bitboards last drawn (pawns..kings, white); None forces a full redraw
+        self._rendered_bbs: Optional[tuple] = None
+        # Image per UNICODE_BY_PT index (piece_type, +6 for black) for the current image set
+        self._img_by_index: tuple = (None,) * 13
+        # Canvas centre of each square for the current orientation
+        self._centers: Dict[int, Tuple[int, int]] = {}
+        self._rendered_images: Optional[dict] = None
+        self._img_ids: Optional[Dict[str, int]] = None
         self.last_move: Optional[chess.Move] = None
         self.dragging_piece: Optional[int] = None
         self.drag_item: Optional[int] = None
-        self.drag_canvas: Optional[tk.Canvas] = None
         self.animating = False
+        # Base square colors are fixed (independent of theme and flip)
+        self._square_bg: Dict[int, str] = {
+            sq: LIGHT_COLOR if (chess.square_rank(sq) + chess.square_file(sq)) % 2 == 0 else DARK_COLOR
+            for sq in chess.SQUARES
+        }
+        # Base colors including the last-move tint, so lookups need no move checks
+        self._base: Dict[int, str] = dict(self._square_bg)
+        
+        # Current fill per square and squares shown in a non-base color;
+        # fill changes go through set_square_color so unchanged squares cost no Tcl call
+        self._bg: Dict[int, str] = {}
+        self._highlighted: set = set()
         
         self._build_grid()
     
@@ -59,15 +80,33 @@ class EnhancedBoardView:
         
         return row, col
     
+    def _square_center(self, square: int) -> Tuple[int, int]:
+        """Canvas pixel coordinates of a square's centre."""
+        row, col = self._get_grid_position(square)
+        return col * SQUARE_SIZE + SQUARE_SIZE // 2, row * SQUARE_SIZE + SQUARE_SIZE // 2
+    
+    def _square_at(self, x: int, y: int) -> Optional[int]:
+        """Square under canvas pixel (x, y), or None outside the board."""
+        col, row = x // SQUARE_SIZE, y // SQUARE_SIZE
+        if not (0 <= col < 8 and 0 <= row < 8):
+            return None
+        if self.flipped:
+            return chess.square(7 - col, row)
+        return chess.square(col, 7 - row)
+    
     def _build_grid(self):
-        """Build the board grid with canvases."""
+        """Build the board canvas and coordinate labels."""
         colors = self._get_colors()
 
         # Clear existing grid
         for widget in self.parent.winfo_children():
             widget.destroy()
-        self.canvases.clear()
+        self._sq_rect.clear()
         self.piece_items.clear()
+        self._rendered_bbs = None
+        self._centers = {sq: self._square_center(sq) for sq in chess.SQUARES}
+        self._bg.clear()
+        self._highlighted.clear()
         
         # Create coordinate labels if enabled
         if self.show_coordinates:
@@ -87,61 +126,59 @@ class EnhancedBoardView:
                                bg=colors['bg'], fg=colors['fg'])
                 label.grid(row=r, column=8, sticky='w', padx=2)
         
+        # Keep label rows/columns aligned with the squares drawn on the canvas
+        for i in range(8):
+            self.parent.grid_columnconfigure(i, minsize=SQUARE_SIZE)
+            self.parent.grid_rowconfigure(i, minsize=SQUARE_SIZE)
+        
+        canvas = tk.Canvas(self.parent, width=BOARD_SIZE * SQUARE_SIZE, height=BOARD_SIZE * SQUARE_SIZE,
+                           highlightthickness=0, cursor='hand2')
+        canvas.grid(row=0, column=0, rowspan=8, columnspan=8)
+        self.canvas = canvas
+        
         # Create board squares
         for square in range(64):
             row, col = self._get_grid_position(square)
-            rank = chess.square_rank(square)
-            file = chess.square_file(square)
+            x0, y0 = col * SQUARE_SIZE, row * SQUARE_SIZE
             
-            # Determine square color
             # Theme should NOT affect base board squares; use fixed classic colors
-            is_light = (rank + file) % 2 == 0
-            square_color = LIGHT_COLOR if is_light else DARK_COLOR
-            
-            canvas = tk.Canvas(self.parent, width=SQUARE_SIZE, height=SQUARE_SIZE,
-                             bg=square_color, highlightthickness=0)
-            canvas.grid(row=row, column=col)
-            
-            # Bind events
-            canvas.bind('<Button-1>', lambda e, s=square: self._on_press(e, s))
-            canvas.bind('<B1-Motion>', lambda e, s=square: self._on_drag(e, s))
-            canvas.bind('<ButtonRelease-1>', lambda e, s=square: self._on_release(e, s))
-            canvas.configure(cursor='hand2')
+            square_color = self._base[square]
             
-            self.canvases[square] = canvas
+            self._sq_rect[square] = canvas.create_rectangle(
+                x0, y0, x0 + SQUARE_SIZE, y0 + SQUARE_SIZE, fill=square_color, width=0)
             self.piece_items[square] = None
+            self._bg[square] = square_color
+        
+        # Bind events once for the whole board
+        canvas.bind('<Button-1>', self._on_press)
+        canvas.bind('<B1-Motion>', self._on_drag)
+        canvas.bind('<ButtonRelease-1>', self._on_release)
     
-    def _on_press(self, event: tk.Event, square: int) -> None:
+    def _on_press(self, event: tk.Event) -> None:
         """Handle mouse press - start drag."""
-        self.dragging_piece = square
+        self.dragging_piece = self._square_at(event.x, event.y)
         # Will handle in on_click callback
     
-    def _on_drag(self, event: tk.Event, square: int) -> None:
+    def _on_drag(self, event: tk.Event) -> None:
         """Handle mouse drag."""
         if self.dragging_piece is None or self.animating:
             return
         
-        canvas = self.canvases.get(self.dragging_piece)
-        if not canvas:
-            return
-        
-        # Create floating piece if not already created
+        # Remember the dragged piece item if not already done
         if self.drag_item is None and self.piece_items.get(self.dragging_piece):
-            # Store original item
             self.drag_item = self.piece_items[self.dragging_piece]
-            self.drag_canvas = canvas
     
-    def _on_release(self, event: tk.Event, square: int) -> None:
+    def _on_release(self, event: tk.Event) -> None:
         """Handle mouse release - complete move."""
         if self.dragging_piece is not None:
             # Call the click handler with from and to squares
+            square = self._square_at(event.x, event.y)
             self.on_click(self.dragging_piece)
-            if square != self.dragging_piece:
+            if square is not None and square != self.dragging_piece:
                 self.on_click(square)
         
         self.dragging_piece = None
         self.drag_item = None
-        self.drag_canvas = None
     
     def flip_board(self) -> None:
         """Flip board orientation."""
@@ -162,56 +199,67 @@ class EnhancedBoardView:
     def update(self, board: chess.Board, piece_images: Optional[dict]):
         """Render pieces for current board state."""
         colors = self._get_colors()
+        # A different image set invalidates every drawn piece; compare by the
+        # ids of the PhotoImages so an equivalent dict does not force a redraw
+        if piece_images is not self._rendered_images:
+            img_ids = {k: id(v) for k, v in piece_images.items()} if piece_images else None
+            if img_ids != self._img_ids:
+                self._img_ids = img_ids
+                self._rendered_bbs = None
+                images = piece_images or {}
+                self._img_by_index = (None,) + tuple(
+                    images.get(sym) for sym in ('P', 'N', 'B', 'R', 'Q', 'K', 'p', 'n', 'b', 'r', 'q', 'k'))
+            self._rendered_images = piece_images
         
-        for square, canvas in self.canvases.items():
-            piece = board.piece_at(square)
-            rank = chess.square_rank(square)
-            file = chess.square_file(square)
-            
-            # Determine base square color
-            # Use fixed base board colors regardless of theme
-            is_light = (rank + file) % 2 == 0
-            square_color = LIGHT_COLOR if is_light else DARK_COLOR
-            
-            # Apply last move highlighting
-            if self.last_move and square in [self.last_move.from_square, self.last_move.to_square]:
-                square_color = LAST_MOVE_COLOR
-            
-            canvas.configure(bg=square_color)
-            
+        # Squares outside _highlighted already show their base color
+        self.clear_highlights()
+        
+        # Only squares whose occupant changed since the last draw: XOR the piece bitboards
+        bbs = (board.pawns, board.knights, board.bishops, board.rooks, board.queens, board.kings,
+               board.occupied_co[chess.WHITE])
+        prev = self._rendered_bbs
+        if prev is None:
+            changed = chess.BB_ALL
+        else:
+            changed = 0
+            for now, before in zip(bbs, prev):
+                changed |= now ^ before
+        self._rendered_bbs = bbs
+        if not changed:
+            return
+        
+        # Hoist per-refresh invariants out of the square loop
+        piece_type_at = board.piece_type_at
+        white = board.occupied_co[chess.WHITE]
+        items = self.piece_items
+        glyphs = UNICODE_BY_PT
+        images = self._img_by_index
+        centers = self._centers
+        font = ('Arial', int(SQUARE_SIZE * 0.6), 'bold')
+        canvas = self.canvas
+        
+        for square in chess.scan_forward(changed):
             # Clear existing piece
-            if self.piece_items[square] is not None:
+            item_id = items.get(square)
+            if item_id is not None:
                 try:
-                    item_id = self.piece_items[square]
-                    if item_id is not None:
-                        canvas.delete(item_id)
+                    canvas.delete(item_id)
                 except Exception:
                     pass
-                self.piece_items[square] = None
+                items[square] = None
             
             # Display piece
-            if piece is not None:
-                if piece_images:
-                    key = piece.symbol()
-                    img = piece_images.get(key)
-                    if img:
-                        item_id = canvas.create_image(SQUARE_SIZE // 2, SQUARE_SIZE // 2, image=img)
-                        self.piece_items[square] = item_id
-                        setattr(canvas, '_img_ref', img)
-                    else:
-                        text = PIECE_UNICODE[piece.symbol()]
-                        item_id = canvas.create_text(SQUARE_SIZE // 2, SQUARE_SIZE // 2,
-                                                    text=text,
-                                                    font=('Arial', int(SQUARE_SIZE * 0.6), 'bold'),
-                                                    fill='black')
-                        self.piece_items[square] = item_id
+            piece_type = piece_type_at(square)
+            if piece_type:
+                index = piece_type + (0 if white & chess.BB_SQUARES[square] else 6)
+                img = images[index]
+                x, y = centers[square]
+                if img:
+                    # The image dict is kept in _rendered_images, which holds the refs
+                    items[square] = canvas.create_image(x, y, image=img)
                 else:
-                    text = PIECE_UNICODE[piece.symbol()]
-                    item_id = canvas.create_text(SQUARE_SIZE // 2, SQUARE_SIZE // 2,
-                                                text=text,
-                                                font=('Arial', int(SQUARE_SIZE * 0.6), 'bold'),
-                                                fill='black')
-                    self.piece_items[square] = item_id
+                    items[square] = canvas.create_text(x, y, text=glyphs[index],
+                                                       font=font, fill='black')
     
     def animate_move(self, move: chess.Move, board: chess.Board,
                     piece_images: Optional[dict], callback: Optional[Callable] = None) -> None:
@@ -223,58 +271,43 @@ class EnhancedBoardView:
         from_square = move.from_square
         to_square = move.to_square
         
-        from_row, from_col = self._get_grid_position(from_square)
-        to_row, to_col = self._get_grid_position(to_square)
+        from_x, from_y = self._centers[from_square]
+        to_x, to_y = self._centers[to_square]
+        canvas = self.canvas
         
         # Get piece info
         piece = board.piece_at(from_square)
-        if not piece:
+        if not piece or canvas is None:
             self.animating = False
             if callback:
                 callback()
             return
         
-        # Create animation canvas
-        anim_canvas = tk.Canvas(self.parent, width=SQUARE_SIZE, height=SQUARE_SIZE,
-                               bg='', highlightthickness=0)
-        anim_canvas.grid(row=from_row, column=from_col)
-        try:
-            anim_canvas.lift(aboveThis=self.parent)  # type: ignore
-        except Exception:
-            pass
-        
-        # Draw piece on animation canvas
+        # Draw the moving piece on top of the board
         if piece_images and piece.symbol() in piece_images:
             img = piece_images[piece.symbol()]
-            anim_item = anim_canvas.create_image(SQUARE_SIZE // 2, SQUARE_SIZE // 2, image=img)
-            setattr(anim_canvas, '_img_ref', img)
+            anim_item = canvas.create_image(from_x, from_y, image=img)
         else:
-            text = PIECE_UNICODE[piece.symbol()]
-            anim_item = anim_canvas.create_text(SQUARE_SIZE // 2, SQUARE_SIZE // 2,
-                                               text=text,
-                                               font=('Arial', int(SQUARE_SIZE * 0.6), 'bold'),
-                                               fill='black')
+            text = UNICODE_BY_PT[piece.piece_type + (0 if piece.color else 6)]
+            anim_item = canvas.create_text(from_x, from_y,
+                                           text=text,
+                                           font=('Arial', int(SQUARE_SIZE * 0.6), 'bold'),
+                                           fill='black')
         
-        # Calculate movement
-        delta_row = to_row - from_row
-        delta_col = to_col - from_col
+        # Calculate per-frame movement
+        step_x = (to_x - from_x) / ANIMATION_FRAMES
+        step_y = (to_y - from_y) / ANIMATION_FRAMES
         
         def animate_frame(frame: int = 0):
             if frame >= ANIMATION_FRAMES:
-                anim_canvas.destroy()
+                canvas.delete(anim_item)
                 self.animating = False
                 if callback:
                     callback()
                 return
             
-            # Calculate position
-            progress = frame / ANIMATION_FRAMES
-            new_row = from_row + (delta_row * progress)
-            new_col = from_col + (delta_col * progress)
-            
-            # Move canvas
-            anim_canvas.grid(row=from_row, column=from_col, rowspan=1, columnspan=1)
-            anim_canvas.place(x=int(new_col * SQUARE_SIZE), y=int(new_row * SQUARE_SIZE))
+            # Move the piece item
+            canvas.move(anim_item, step_x, step_y)
             
             # Schedule next frame
             self.parent.after(ANIMATION_DELAY, lambda: animate_frame(frame + 1))
@@ -284,45 +317,58 @@ class EnhancedBoardView:
     
     def highlight_last_move(self, move: Optional[chess.Move]) -> None:
         """Store last move for highlighting."""
+        # Old and new last-move squares both change color on the next clear/update
+        base = self._base
+        for mv in (self.last_move, move):
+            if mv:
+                self._highlighted.update((mv.from_square, mv.to_square))
+                base[mv.from_square] = self._square_bg[mv.from_square]
+                base[mv.to_square] = self._square_bg[mv.to_square]
+        if move:
+            base[move.from_square] = base[move.to_square] = LAST_MOVE_COLOR
         self.last_move = move
     
+    def _base_color(self, square: int) -> str:
+        """Fixed square color, or the last-move color for the last move's squares."""
+        return self._base[square]
+    
+    def set_square_color(self, square: int, color: str) -> None:
+        """Set a square's background, skipping the configure call if it is unchanged."""
+        rect = self._sq_rect.get(square)
+        if rect is None:
+            return
+        if self._bg.get(square) != color:
+            self.canvas.itemconfigure(rect, fill=color)
+            self._bg[square] = color
+        if color != self._base_color(square):
+            self._highlighted.add(square)
+        else:
+            self._highlighted.discard(square)
+    
     def highlight(self, square: int):
         """Highlight a specific square."""
-        colors = self._get_colors()
-        canvas = self.canvases.get(square)
-        if canvas:
-            canvas.configure(bg=HIGHLIGHT_COLOR)
+        self.set_square_color(square, HIGHLIGHT_COLOR)
     
     def clear_highlights(self):
-        """Reset all squares to normal colors."""
-        colors = self._get_colors()
-        for square, canvas in self.canvases.items():
-            rank = chess.square_rank(square)
-            file = chess.square_file(square)
-            # Restore fixed base board colors
-            is_light = (rank + file) % 2 == 0
-            square_color = LIGHT_COLOR if is_light else DARK_COLOR
-            
-            # Preserve last move highlighting
-            if self.last_move and square in [self.last_move.from_square, self.last_move.to_square]:
-                square_color = LAST_MOVE_COLOR
-            
-            canvas.configure(bg=square_color)
+        """Reset highlighted squares to normal colors."""
+        for square in list(self._highlighted):
+            self.set_square_color(square, self._base_color(square))
     
     def show_legal_moves(self, board: chess.Board, square: int):
         """Show legal moves for a piece."""
         self.clear_highlights()
-        colors = self._get_colors()
         
-        for move in board.legal_moves:
-            if move.from_square == square:
-                to_square = move.to_square
-                canvas = self.canvases.get(to_square)
-                if canvas:
-                    if board.is_capture(move):
-                        canvas.configure(bg=CAPTURE_COLOR)
-                    else:
-                        canvas.configure(bg=LEGAL_MOVE_COLOR)
+        # Capture test from bitboards computed once, rather than is_capture() per move
+        bb_squares = chess.BB_SQUARES
+        occ_opp = board.occupied_co[not board.turn]
+        ep = board.ep_square
+        is_pawn = bool(bb_squares[square] & board.pawns)
+        for move in board.generate_legal_moves(from_mask=bb_squares[square]):
+            to_square = move.to_square
+            if bb_squares[to_square] & occ_opp or (is_pawn and to_square == ep):
+                self.set_square_color(to_square, CAPTURE_COLOR)
+            else:
+                self.set_square_color(to_square, LEGAL_MOVE_COLOR)
     
     def apply_special_overlays(self, board: chess.Board, overlay_icons: Optional[dict] = None):
         """Apply overlays for special moves."""
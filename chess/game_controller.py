@@ -18,1028 +18,42 @@ Architecture:
 - ConfigManager, SoundManager, ChessClock: Optional feature modules
 """
 
+import os
+import shutil
 import sys
+import threading
+import time
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from typing import Optional
 import chess  # type: ignore - Python-chess library handles all chess rules (legal moves, check, checkmate, castling, en passant, etc.)
+import chess.pgn  # type: ignore
 from simple_ai import SimpleAI
 from training_ai import TrainingAI
 from engine_manager import EngineManager
 from engine_adapter import EngineAdapter
-    KING_MIDDLEGAME_TABLE = [
-        -30,-40,-40,-50,-50,-40,-40,-30,
-        -30,-40,-40,-50,-50,-40,-40,-30,
-        -30,-40,-40,-50,-50,-40,-40,-30,
-        -30,-40,-40,-50,-50,-40,-40,-30,
-        -20,-30,-30,-40,-40,-30,-30,-20,
-        -10,-20,-20,-20,-20,-20,-20,-10,
-        20, 20,  0,  0,  0,  0, 20, 20,
-        20, 30, 10,  0,  0, 10, 30, 20
-    ]
-    
-    KING_ENDGAME_TABLE = [
-        -50,-40,-30,-20,-20,-30,-40,-50,
-        -30,-20,-10,  0,  0,-10,-20,-30,
-        -30,-10, 20, 30, 30, 20,-10,-30,
-        -30,-10, 30, 40, 40, 30,-10,-30,
-        -30,-10, 30, 40, 40, 30,-10,-30,
-        -30,-10, 20, 30, 30, 20,-10,-30,
-        -30,-30,  0,  0,  0,  0,-30,-30,
-        -50,-30,-30,-30,-30,-30,-30,-50
-    ]
-    
-    # Opening book: maps starting positions (FEN) to good opening moves (UCI notation)
-    # Helps AI play reasonable openings before deep search is feasible
-    # FEN format: piece placement, side to move, castling rights, en passant, halfmove, fullmove
-    OPENING_BOOK = {
-        "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1": ["e2e4", "d2d4", "c2c4", "g1f3"],  # Starting position
-        "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1": ["e7e5", "c7c5", "e7e6", "c7c6"],  # After 1.e4
-        "rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2": ["g1f3", "f1c4", "b1c3"],  # After 1.e4 e5
-        "rnbqkbnr/pppp1ppp/8/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 1 2": ["b8c6", "g8f6"],  # After 1.e4 e5 2.Nf3
-        "rnbqkbnr/pppppppp/8/8/3P4/8/PPP1PPPP/RNBQKBNR b KQkq - 0 1": ["g8f6", "d7d5", "e7e6"],  # After 1.d4
-        "rnbqkb1r/pppppppp/5n2/8/3P4/8/PPP1PPPP/RNBQKBNR w KQkq - 1 2": ["c2c4", "g1f3"],  # After 1.d4 Nf6
-    }
-
-    def __init__(self, depth=3):
-        """
-        Initialize the AI engine.
-        
-        Args:
-            depth: Maximum search depth (ply). Higher = stronger but slower.
-                   Typical values: 3-6. Each +1 roughly 3-5x slower.
-        """
-        self.depth = depth
-        self.nodes_searched = 0  # Counter for performance analysis
-        
-        # Transposition table: cache evaluated positions to avoid re-searching
-        # Key: board FEN string
-        # Value: (score, depth_searched, bound_flag, best_move_uci)
-        # Bound flags: 'EXACT' (= real value), 'LOWER' (>=), 'UPPER' (<=)
-        self.transposition_table: dict = {}
-        
-        # Killer moves: non-capture moves that caused beta cutoffs at each depth
-        # Key: depth (int), Value: list of up to 2 move UCIs
-        # Tried early in move ordering since they often cause cutoffs again
-        self.killers: dict[int, list[str]] = {}
-        
-        # History heuristic: rewards moves that historically caused beta cutoffs
-        # Key: move UCI, Value: accumulated score (depth^2 per cutoff)
-        self.history: dict[str, int] = {}
-        
-        # Learning database: persistent memory of past game outcomes
-        # Key: "fen_position|move_uci", Value: {"w": wins, "l": losses, "d": draws}
-        self.learning_db: dict = {}
-        
-        # Per-game log: accumulates choices made this game for learning update on game end
-        # Each entry: (fen_key, move_uci, color_to_move_bool)
-        self.game_log: list[tuple[str, str, bool]] = []
-        
-        # Path to persistent learning file
-        self._learning_path = os.path.join(os.path.dirname(__file__), 'ai_learn.json')
-        self._learning_path_gz = self._learning_path + '.gz'
-        self._load_learning_db()
-        
-        # Toggle for learning bias in move ordering
-        self.use_learning = True
-
-        # Training persistence and storage controls
-        # When defer_persistence is True, finalize_game will batch disk writes
-        self.defer_persistence: bool = False
-        self.persist_every_n: int = 100
-        self._pending_games: int = 0
-        # Skip readable export during training batches by default
-        self.export_readable_during_training: bool = False
-        # Compress learning file to save disk space (writes ai_learn.json.gz)
-        self.compress_learning: bool = True
-
-    # ==================== Learning System ====================
-    # These methods handle persistent learning across games
-    
-    def _load_learning_db(self) -> None:
-        """Load the learning database from disk (if it exists)."""
-        try:
-            import json, gzip
-            data = None
-            # Prefer compressed file if available
-            if os.path.exists(self._learning_path_gz):
-                with gzip.open(self._learning_path_gz, 'rt', encoding='utf-8') as f:
-                    data = json.load(f)
-            elif os.path.exists(self._learning_path):
-                with open(self._learning_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    if isinstance(data, dict):
-                        self.learning_db = data
-            # If we loaded from uncompressed file but compression is enabled, migrate on next save
-        except Exception:
-            # If file corrupt or missing, start with empty database
-            self.learning_db = {}
-
-    def _save_learning_db(self) -> None:
-        """Persist the learning database to disk."""
-        try:
-            import json, gzip
-            if getattr(self, 'compress_learning', False):
-                # Write compressed
-                with gzip.open(self._learning_path_gz, 'wt', encoding='utf-8') as f:
-                    json.dump(self.learning_db, f, separators=(',', ':'), ensure_ascii=False)
-                # Try to remove uncompressed file to save space
-                try:
-                    if os.path.exists(self._learning_path):
-                        os.remove(self._learning_path)
-                except Exception:
-                    pass
-            else:
-                with open(self._learning_path, 'w', encoding='utf-8') as f:
-                    json.dump(self.learning_db, f, separators=(',', ':'), ensure_ascii=False)
-        except Exception:
-            pass  # Silently fail to avoid disrupting gameplay
-
-    def _log_choice(self, fen_key: str, move_uci: str, color_to_move: bool) -> None:
-        """
-        Record an AI move choice for later learning update.
-        
-        Args:
-            fen_key: Position (piece placement part of FEN)
-            move_uci: Move in UCI notation (e.g., 'e2e4')
-            color_to_move: True if white to move, False if black
-        """
-        try:
-            self.game_log.append((fen_key, move_uci, color_to_move))
-        except Exception:
-            pass
-
-    def finalize_game(self, result: str) -> None:
-        """
-        Apply game outcome to all logged moves, updating learning database.
-        
-        Called once per game after checkmate/stalemate/insufficient material.
-        Updates win/loss/draw counts for each (position, move) pair.
-        
-        Args:
-            result: 'white', 'black', or 'draw' — indicates winner
-        """
-        try:
-            if not self.game_log:
-                return
-            
-            # Process each logged move from this game
-            for fen_key, move_uci, color_to_move in self.game_log:
-                key = fen_key + '|' + move_uci  # Combined key for database lookup
-                rec = self.learning_db.get(key) or {"w": 0, "l": 0, "d": 0}
-                
-                # Update counts based on result
-                if result == 'draw':
-                    rec["d"] = rec.get("d", 0) + 1  # Increment draw count
-                else:
-                    winner_is_white = (result == 'white')
-                    # If the side that made this move won, it's a win; otherwise a loss
-                    if winner_is_white == color_to_move:
-                        rec["w"] = rec.get("w", 0) + 1
-                    else:
-                        rec["l"] = rec.get("l", 0) + 1
-                self.learning_db[key] = rec
-            
-            # Clear the game log for next game
-            self.game_log = []
-            
-            # Persist to disk (batched if training mode defers persistence)
-            if getattr(self, 'defer_persistence', False):
-                # Batch persistence for speed during training
-                self._pending_games = int(getattr(self, '_pending_games', 0)) + 1
-                threshold = int(getattr(self, 'persist_every_n', 100))
-                if self._pending_games >= max(1, threshold):
-                    self._save_learning_db()
-                    # Optionally export readable file during training batches
-                    if bool(getattr(self, 'export_readable_during_training', False)):
-                        try:
-                            self.export_readable_learning()
-                        except Exception:
-                            pass
-                    self._pending_games = 0
-            else:
-                # Default behavior: save and export after every game
-                self._save_learning_db()
-                try:
-                    self.export_readable_learning()
-                except Exception:
-                    pass
-        except Exception:
-            pass
-
-    def export_readable_learning(self, path: 'Optional[str]' = None) -> 'Optional[str]':
-        """
-        Export learning database to a human-readable JSON file.
-        
-        Creates a file with:
-        - Metadata (version, timestamp, counts)
-        - Positions grouped by FEN
-        - For each move: wins, losses, draws, games, winrate, and ordering bonus
-        
-        The ordering_bonus shows the exact value (+/- centipawns) the AI adds
-        to move ordering for that (position, move) pair.
-        
-        Args:
-            path: Optional custom save path. Defaults to ai_learn_readable.json
-            
-        Returns:
-            Path to saved file, or None on error
-        """
-        try:
-            import json, time
-            
-            # Aggregate raw database into positions -> moves structure
-            positions: dict[str, dict] = {}
-            for key, rec in self.learning_db.items():
-                if '|' not in key:
-                    continue  # Skip malformed keys
-                    
-                fen_key, move_uci = key.split('|', 1)
-                entry = positions.setdefault(fen_key, {"moves": {}})
-                entry["moves"][move_uci] = {
-                    "wins": int(rec.get('w', 0)),
-                    "losses": int(rec.get('l', 0)),
-                    "draws": int(rec.get('d', 0)),
-                }
-            
-            # Compute derived statistics (games, winrate, ordering bonus)
-            total_positions = 0
-            total_entries = 0
-            for fen_key, entry in positions.items():
-                moves = entry.get("moves", {})
-                for mv, r in moves.items():
-                    games = r["wins"] + r["losses"] + r["draws"]
-                    r["games"] = games
-                    # Winrate: wins + 0.5*draws (treating draws as half-wins)
-                    r["winrate"] = 0.0 if games == 0 else round((r["wins"] + 0.5 * r["draws"]) / games, 3)
-                    # Ordering bonus: scaled from -100 to +100 based on winrate deviation from 50%
-                    r["ordering_bonus"] = int((r["winrate"] - 0.5) * 200)
-                    total_entries += 1
-                total_positions += 1
-            
-            # Build final output with metadata
-            blob = {
-                "meta": {
-                    "version": 1,
-                    "updated": time.strftime('%Y-%m-%d %H:%M:%S'),
-                    "total_positions": total_positions,
-                    "total_entries": total_entries,
-                    "notes": "AI uses these stats to slightly bias move ordering; this does not change evaluation.",
-                },
-                "positions": positions,
-            }
-            
-            out_path = path or os.path.join(os.path.dirname(self._learning_path), 'ai_learn_readable.json')
-            with open(out_path, 'w', encoding='utf-8') as f:
-                # Minified to reduce size; still viewable
-                json.dump(blob, f, separators=(',', ':'), ensure_ascii=False)
-            return out_path
-        except Exception:
-            return None
-
-    def _learn_bonus(self, fen_key: str, move_uci: str) -> int:
-        """
-        Calculate move ordering bonus from learned statistics.
-        
-        Returns a small integer bonus (+/- ~100) based on the historical
-        success rate of this move in this position. Moves that led to more
-        wins get positive bonuses; moves that led to losses get penalties.
-        
-        This does NOT change the evaluation function—it only influences the
-        order in which moves are tried, which can speed up alpha-beta pruning.
-        
-        Args:
-            fen_key: Position (piece placement from FEN)
-            move_uci: Move in UCI notation
-            
-        Returns:
-            Ordering bonus in centipawns (typically -100 to +100)
-        """
-        try:
-            rec = self.learning_db.get(fen_key + '|' + move_uci)
-            if not rec:
-                return 0  # No learning data for this position/move
-                
-            w = int(rec.get('w', 0))
-            l = int(rec.get('l', 0))
-            d = int(rec.get('d', 0))
-            tot = w + l + d
-            if tot == 0:
-                return 0  # No games recorded yet
-                
-            # Calculate winrate (0.0 to 1.0), treating draws as 0.5
-            rating = (w + 0.5 * d) / tot
-            
-            # Scale to bonus: -100 (0% winrate) to +100 (100% winrate)
-            # 50% winrate = 0 bonus (neutral)
-            bonus = int((rating - 0.5) * 200)
-            return bonus
-        except Exception:
-            return 0
-
-    # ==================== Evaluation Functions ====================
-    
-    def game_phase(self, board: chess.Board) -> int:
-        """
-        Determine current game phase for tapered evaluation.
-        
-        Different phases use different strategies:
-        - Opening: book moves, rapid development
-        - Middlegame: king safety critical, aggressive piece placement
-        - Endgame: king should be active, pawns become more valuable
-        
-        Returns:
-            0 = Opening (< 10 moves)
-            1 = Middlegame (normal material)
-            2 = Endgame (≤ 6 minor/major pieces total)
-        """
-        # Count non-pawn pieces (queens, rooks, bishops, knights)
-        total_material = sum(len(board.pieces(pt, chess.WHITE)) + len(board.pieces(pt, chess.BLACK)) 
-                            for pt in [chess.QUEEN, chess.ROOK, chess.BISHOP, chess.KNIGHT])
-        
-        if len(board.move_stack) < 10:
-            return 0  # Opening: first 10 moves
-        elif total_material <= 6:  # Few pieces left (endgame threshold)
-            return 2  # Endgame
-        else:
-            return 1  # Middlegame
-
-    def get_piece_square_value(self, piece: chess.Piece, square: int, phase: int) -> int:
-        """
-        Get positional bonus/penalty for a piece on a specific square.
-        
-        Uses piece-square tables to encourage good piece placement:
-        - Pawns: advance toward promotion
-        - Knights: centralize
-        - Bishops: control long diagonals
-        - Rooks: open files and 7th rank
-        - Queens: flexible but avoid early development
-        - Kings: castle in middlegame, activate in endgame
-        
-        Args:
-            piece: Chess piece (type and color)
-            square: Square index (0-63, a1=0, h8=63)
-            phase: Game phase (0=opening, 1=middlegame, 2=endgame)
-            
-        Returns:
-            Bonus in centipawns (can be negative for bad squares)
-        """
-        # Mirror square for black pieces (tables are from white's perspective)
-        sq = square if piece.color == chess.WHITE else chess.square_mirror(square)
-        
-        if piece.piece_type == chess.PAWN:
-            return self.PAWN_TABLE[sq]
-        elif piece.piece_type == chess.KNIGHT:
-            return self.KNIGHT_TABLE[sq]
-        elif piece.piece_type == chess.BISHOP:
-            return self.BISHOP_TABLE[sq]
-        elif piece.piece_type == chess.ROOK:
-            return self.ROOK_TABLE[sq]
-        elif piece.piece_type == chess.QUEEN:
-            return self.QUEEN_TABLE[sq]
-        elif piece.piece_type == chess.KING:
-            if phase == 2:  # Endgame
-                return self.KING_ENDGAME_TABLE[sq]
-            else:
-                return self.KING_MIDDLEGAME_TABLE[sq]
-        return 0
-
-    def evaluate(self, board: chess.Board) -> int:
-        """Enhanced evaluation with material, position, mobility, king safety, and pawn structure"""
-        if board.is_checkmate():
-            return -20000 if board.turn == chess.WHITE else 20000
-        if board.is_stalemate() or board.is_insufficient_material():
-            return 0
-        
-        phase = self.game_phase(board)
-        score = 0
-        
-        # Material and positional values
-        for square in chess.SQUARES:
-            piece = board.piece_at(square)
-            if piece:
-                value = self.PIECE_VALUES[piece.piece_type]
-                pos_value = self.get_piece_square_value(piece, square, phase)
-                if piece.color == chess.WHITE:
-                    score += value + pos_value
-                else:
-                    score -= value + pos_value
-        
-        # Mobility (piece activity)
-        score += self.evaluate_mobility(board)
-        
-        # King safety
-        score += self.evaluate_king_safety(board, chess.WHITE, phase)
-        score -= self.evaluate_king_safety(board, chess.BLACK, phase)
-        
-        # Pawn structure
-        score += self.evaluate_pawn_structure(board, chess.WHITE)
-        score -= self.evaluate_pawn_structure(board, chess.BLACK)
-        
-        # Bishop pair bonus
-        if len(board.pieces(chess.BISHOP, chess.WHITE)) >= 2:
-            score += 30
-        if len(board.pieces(chess.BISHOP, chess.BLACK)) >= 2:
-            score -= 30
-        
-        return score if board.turn == chess.WHITE else -score
-
-    def evaluate_mobility(self, board: chess.Board) -> int:
-        """Evaluate piece mobility (number of legal moves)"""
-        current_turn = board.turn
-        
-        board.turn = chess.WHITE
-        white_mobility = board.legal_moves.count()
-        
-        board.turn = chess.BLACK  
-        black_mobility = board.legal_moves.count()
-        
-        board.turn = current_turn
-        
-        return (white_mobility - black_mobility) * 3
-
-    def evaluate_king_safety(self, board: chess.Board, color: bool, phase: int) -> int:
-        """Evaluate king safety based on game phase"""
-        if phase == 2:  # Endgame - king should be active
-            return 0
-        
-        score = 0
-        king_square = board.king(color)
-        if king_square is None:
-            return 0
-        
-        king_file = chess.square_file(king_square)
-        king_rank = chess.square_rank(king_square)
-        
-        # Penalize king in center during middlegame
-        if phase == 1:
-            if 2 <= king_file <= 5:
-                score -= 40
-        
-        # Bonus for castled position
-        if color == chess.WHITE:
-            if king_square in [chess.G1, chess.C1]:
-                score += 50
-                # Bonus for pawn shield
-                if king_square == chess.G1:
-                    f2_piece = board.piece_at(chess.F2)
-                    if f2_piece and f2_piece.piece_type == chess.PAWN:
-                        score += 10
-                    g2_piece = board.piece_at(chess.G2)
-                    if g2_piece and g2_piece.piece_type == chess.PAWN:
-                        score += 10
-                    h2_piece = board.piece_at(chess.H2)
-                    if h2_piece and h2_piece.piece_type == chess.PAWN:
-                        score += 10
-        else:
-            if king_square in [chess.G8, chess.C8]:
-                score += 50
-                if king_square == chess.G8:
-                    f7_piece = board.piece_at(chess.F7)
-                    if f7_piece and f7_piece.piece_type == chess.PAWN:
-                        score += 10
-                    g7_piece = board.piece_at(chess.G7)
-                    if g7_piece and g7_piece.piece_type == chess.PAWN:
-                        score += 10
-                    h7_piece = board.piece_at(chess.H7)
-                    if h7_piece and h7_piece.piece_type == chess.PAWN:
-                        score += 10
-        
-        return score
-
-    def evaluate_pawn_structure(self, board: chess.Board, color: bool) -> int:
-        """Evaluate pawn structure: passed pawns, doubled pawns, isolated pawns"""
-        score = 0
-        pawns = board.pieces(chess.PAWN, color)
-        
-        for pawn_square in pawns:
-            pawn_file = chess.square_file(pawn_square)
-            pawn_rank = chess.square_rank(pawn_square)
-            
-            # Check for passed pawn
-            if self.is_passed_pawn(board, pawn_square, color):
-                # More valuable closer to promotion
-                if color == chess.WHITE:
-                    score += 20 + (pawn_rank * 10)
-                else:
-                    score += 20 + ((7 - pawn_rank) * 10)
-            
-            # Check for doubled pawns
-            same_file = [sq for sq in pawns if chess.square_file(sq) == pawn_file]
-            if len(same_file) > 1:
-                score -= 15
-            
-            # Check for isolated pawns
-            if self.is_isolated_pawn(board, pawn_square, color):
-                score -= 20
-            
-            # Check for backward pawns
-            if self.is_backward_pawn(board, pawn_square, color):
-                score -= 10
-        
-        return score
-
-    def is_passed_pawn(self, board: chess.Board, square: int, color: bool) -> bool:
-        """Check if pawn is passed (no enemy pawns ahead)"""
-        pawn_file = chess.square_file(square)
-        pawn_rank = chess.square_rank(square)
-        
-        enemy_color = not color
-        enemy_pawns = board.pieces(chess.PAWN, enemy_color)
-        
-        for enemy_pawn in enemy_pawns:
-            ep_file = chess.square_file(enemy_pawn)
-            ep_rank = chess.square_rank(enemy_pawn)
-            
-            # Check if enemy pawn is in front or adjacent files
-            if abs(ep_file - pawn_file) <= 1:
-                if color == chess.WHITE and ep_rank > pawn_rank:
-                    return False
-                if color == chess.BLACK and ep_rank < pawn_rank:
-                    return False
-        
-        return True
-
-    def is_isolated_pawn(self, board: chess.Board, square: int, color: bool) -> bool:
-        """Check if pawn has no friendly pawns on adjacent files"""
-        pawn_file = chess.square_file(square)
-        friendly_pawns = board.pieces(chess.PAWN, color)
-        
-        for friendly_pawn in friendly_pawns:
-            if friendly_pawn != square:
-                fp_file = chess.square_file(friendly_pawn)
-                if abs(fp_file - pawn_file) == 1:
-                    return False
-        
-        return True
-
-    def is_backward_pawn(self, board: chess.Board, square: int, color: bool) -> bool:
-        """Check if pawn is behind all friendly pawns on adjacent files"""
-        pawn_file = chess.square_file(square)
-        pawn_rank = chess.square_rank(square)
-        friendly_pawns = board.pieces(chess.PAWN, color)
-        
-        for friendly_pawn in friendly_pawns:
-            if friendly_pawn != square:
-                fp_file = chess.square_file(friendly_pawn)
-                fp_rank = chess.square_rank(friendly_pawn)
-                
-                if abs(fp_file - pawn_file) == 1:
-                    if color == chess.WHITE and fp_rank < pawn_rank:
-                        return True
-                    if color == chess.BLACK and fp_rank > pawn_rank:
-                        return True
-        
-        return False
-
-    def quiescence(self, board: chess.Board, alpha: int, beta: int) -> int:
-        """
-        Quiescence search: extends search to stable positions to avoid horizon effect.
-        
-        The "horizon effect" is when the engine stops searching mid-combination,
-        giving a false evaluation. For example:
-        - Engine searches to depth 4 and sees "I can win a queen!"
-        - But at depth 5, the opponent recaptures with check
-        - Without quiescence, engine only sees the queen capture, not the recapture
-        
-        Solution: At depth 0, keep searching until position is "quiet" (no captures).
-        Only tactical moves (captures) are searched, not all moves.
-        
-        This is much cheaper than full search because:
-        1. Only ~5-10% of legal moves are captures
-        2. We stop as soon as position stabilizes (stand_pat evaluation)
-        
-        Args:
-            board: Current position
-            alpha, beta: Alpha-beta bounds
-            
-        Returns:
-            Evaluation score when position is stable
-        """
-        # ===== STAND-PAT EVALUATION =====
-        # Evaluate current position without any moves
-        # If this is already good enough (>= beta), we can stop
-        stand_pat = self.evaluate(board)
-        
-        if stand_pat >= beta:
-            return beta  # Beta cutoff: position is too good, prune
-        if alpha < stand_pat:
-            alpha = stand_pat  # Update alpha if current position is better
-        
-        # ===== CAPTURE-ONLY SEARCH =====
-        # Generate only capture moves (tactical)
-        capture_moves = [move for move in board.legal_moves if board.is_capture(move)]
-        # Sort by MVV-LVA (Most Valuable Victim - Least Valuable Attacker)
-        # Try queen captures before pawn captures
-        capture_moves.sort(key=lambda m: self._move_score(board, m), reverse=True)
-        
-        for move in capture_moves:
-            board.push(move)
-            score = -self.quiescence(board, -beta, -alpha)  # Recursive quiescence
-            board.pop()
-            
-            if score >= beta:
-                return beta  # Beta cutoff
-            if score > alpha:
-                alpha = score  # Improved lower bound
-        
-        return alpha  # Best score found in quiescence
-
-    def negamax(self, board: chess.Board, depth: int, alpha: int, beta: int) -> int:
-        """
-        Negamax search with alpha-beta pruning, PVS, and LMR.
-        
-        This is the core search function that explores the game tree to find the best move.
-        
-        Key optimizations:
-        1. Transposition Table: Avoids re-searching positions we've seen before
-        2. Principal Variation Search (PVS): Most of the tree is searched with a null window
-        3. Late Move Reductions (LMR): Less promising moves are searched at reduced depth
-        
-        Args:
-            board: Current position to evaluate
-            depth: How many more plies (half-moves) to search
-            alpha: Lower bound (best score we can guarantee for the side to move)
-            beta: Upper bound (opponent's best alternative elsewhere)
-            
-        Returns:
-            Score in centipawns from the perspective of the side to move
-            (positive = good for current player, negative = good for opponent)
-        """
-        # ===== TRANSPOSITION TABLE PROBE =====
-        # Check if we've already searched this position
-        fen = board.fen()
-        if fen in self.transposition_table:
-            t_score, t_depth, t_flag, _ = self.transposition_table[fen]
-            # Only use cached score if it was searched at equal/greater depth
-            if t_depth >= depth:
-                # EXACT: score is accurate, no need to search
-                if t_flag == 'EXACT':
-                    return t_score
-                # LOWER: real score is at least t_score (caused beta cutoff)
-                # If cached lower bound exceeds beta, we'll cut off again
-                if t_flag == 'LOWER' and t_score >= beta:
-                    return t_score
-                # UPPER: real score is at most t_score (all moves failed low)
-                # If cached upper bound is below alpha, it won't improve
-                if t_flag == 'UPPER' and t_score <= alpha:
-                    return t_score
-
-        # ===== TERMINAL NODE CHECKS =====
-        if board.is_game_over():
-            if board.is_checkmate():
-                score = -9999999  # Opponent wins (we're checkmated)
-            else:
-                score = 0  # Draw (stalemate or insufficient material)
-            self.transposition_table[fen] = (score, depth, 'EXACT', None)
-            return score
-        
-        # ===== DEPTH LIMIT REACHED: QUIESCENCE SEARCH =====
-        # At depth 0, we don't stop immediately—we search tactical moves to avoid
-        # the "horizon effect" (e.g., stopping mid-capture sequence)
-        if depth == 0:
-            score = self.quiescence(board, alpha, beta)
-            self.transposition_table[fen] = (score, depth, 'EXACT', None)
-            return score
-
-        # ===== MOVE GENERATION AND ORDERING =====
-        max_score = -9999999
-        best_move = None
-        moves = list(board.legal_moves)
-        # Good move ordering is critical: if we search the best move first,
-        # we'll get more alpha-beta cutoffs (pruning the rest of the tree)
-        moves = self._order_moves(board, moves, depth)
-
-        # ===== MAIN SEARCH LOOP =====
-        orig_alpha = alpha  # Remember original alpha to determine bound flag
-        for idx, move in enumerate(moves):
-            # First move is the Principal Variation (PV) — most likely best
-            pv = (idx == 0)
-            
-            # Pre-compute move properties for LMR logic
-            try:
-                is_capture = board.is_capture(move)
-                gives_check = board.gives_check(move)
-            except Exception:
-                # Rare: board might be in an unexpected state
-                is_capture = False
-                gives_check = False
-                
-            board.push(move)
-            
-            if pv:
-                # ===== PV NODE: FULL-WINDOW SEARCH =====
-                # First move gets the full alpha-beta window because it's most likely best
-                score = -self.negamax(board, depth - 1, -beta, -alpha)
-            else:
-                # ===== NON-PV NODES: PRINCIPAL VARIATION SEARCH (PVS) =====
-                # Other moves are searched with a "null window" (alpha, alpha+1)
-                # This is much faster because the window is tiny, causing quick cutoffs
-                
-                # Late Move Reductions (LMR):
-                # Moves searched late are less likely to be good (we ordered them poorly)
-                # So we search them at reduced depth first to save time
-                reduction = 0
-                if depth >= 3 and not is_capture and not gives_check and move.promotion is None:
-                    # Only reduce "quiet" moves (non-tactical) after the first few
-                    if idx >= 4:
-                        reduction = 1  # Conservative: only reduce by 1 ply
-                        
-                d2 = max(1, depth - 1 - reduction)
-                
-                # Null-window search (PVS) with possibly reduced depth (LMR)
-                score = -self.negamax(board, d2, -(alpha + 1), -alpha)
-                
-                # If the null-window search suggests this move is better than we thought...
-                if score > alpha:
-                    # Re-search with full window and full depth to get accurate score
-                    # This "fail-soft" behavior ensures we don't miss good moves
-                    score = -self.negamax(board, depth - 1, -beta, -alpha)
-                    
-            board.pop()
-            
-            # ===== UPDATE BEST SCORE =====
-            if score > max_score:
-                max_score = score
-                best_move = move
-                
-            # ===== ALPHA-BETA PRUNING =====
-            alpha = max(alpha, score)
-            if alpha >= beta:
-                # Beta cutoff: This position is too good; opponent won't let us reach it
-                # (They have a better option earlier in the tree)
-                
-                # Record this move as a "killer" and bump its history score
-                # so we'll try it first in sibling positions
-                self._store_killer(depth, move)
-                self._bump_history(move, depth)
-                break  # Prune the rest of the moves
-        
-        # ===== TRANSPOSITION TABLE STORAGE =====
-        # Store the result with a flag indicating what we learned:
-        # - EXACT: we searched all moves and found the true score
-        # - UPPER: all moves were <= orig_alpha (fail-low, no improvement)
-        # - LOWER: at least one move was >= beta (fail-high, caused cutoff)
-        flag = 'EXACT'
-        if max_score <= orig_alpha:
-            flag = 'UPPER'  # Real score could be lower, but at most max_score
-        elif max_score >= beta:
-            flag = 'LOWER'  # Real score could be higher, but at least max_score
-            
-        self.transposition_table[fen] = (max_score, depth, flag, best_move.uci() if best_move else None)
-        return max_score
-
-    def choose_move(self, board: chess.Board) -> 'Optional[chess.Move]':
-        """
-        Choose the best move using iterative deepening with aspiration windows.
-        
-        Iterative Deepening:
-        - Searches depth 1, then depth 2, then depth 3, etc., up to self.depth
-        - Each iteration uses results from previous depth to improve move ordering
-        - Provides best move so far even if time runs out (anytime algorithm)
-        
-        Aspiration Windows:
-        - Instead of searching with infinite bounds (-∞, +∞), use narrow window
-        - Window is centered around previous depth's score
-        - Much faster due to more alpha-beta cutoffs
-        - If search fails outside window, widen and re-search
-        
-        Returns:
-            Best move found, or None if no legal moves (shouldn't happen)
-        """
-        # ===== OPENING BOOK CHECK =====
-        # Check if current position is in our opening book (common opening lines)
-        position_fen = board.fen().split(' ')[0]  # Just piece placement, ignore turn/castling
-        if position_fen in self.OPENING_BOOK:
-            book_moves = self.OPENING_BOOK[position_fen]
-            # Filter for legal moves in case book has illegal entries
-            legal_book_moves = [mv for mv in book_moves if mv in [m.uci() for m in board.legal_moves]]
-            if legal_book_moves:
-                # Play a random move from the book to add variety
-                return chess.Move.from_uci(random.choice(legal_book_moves))
-
-        # ===== ITERATIVE DEEPENING LOOP =====
-        best_move = None
-        prev_score = 0  # Score from previous depth iteration
-        
-        for d in range(1, max(1, self.depth) + 1):
-            # ===== ASPIRATION WINDOW SETUP =====
-            # Window width grows slightly with depth (deeper = less accurate prev_score)
-            window = 30 + d * 10  # e.g., depth 1: ±40, depth 4: ±70
-            
-            # Set alpha/beta bounds around previous score, clamped to valid range
-            alpha = max(-9999999, prev_score - window)
-            beta = min(9999999, prev_score + window)
-            
-            # ===== ASPIRATION SEARCH =====
-            # Try searching with narrow window first
-            move_d, score_d = self._search_root(board, d, alpha, beta)
-            
-            # ===== HANDLE ASPIRATION FAILURES =====
-            # Fail-low: score <= alpha (position is worse than expected)
-            if move_d is not None and score_d <= alpha:
-                # Re-search with alpha = -∞ to find true score
-                move_d, score_d = self._search_root(board, d, -9999999, beta)
-                
-            # Fail-high: score >= beta (position is better than expected)
-            elif move_d is not None and score_d >= beta:
-                # Re-search with beta = +∞ to find true score
-                move_d, score_d = self._search_root(board, d, alpha, 9999999)
-                
-            # ===== UPDATE BEST MOVE =====
-            if move_d is not None:
-                best_move, prev_score = move_d, score_d
-                
-        # ===== LOG CHOICE FOR LEARNING =====
-        # Record the final chosen move so we can update statistics after the game
-        try:
-            if best_move is not None:
-                fen_key = board.fen().split(' ')[0]  # Position (piece placement only)
-                self._log_choice(fen_key, best_move.uci(), board.turn)
-        except Exception:
-            pass  # Don't let logging errors disrupt gameplay
-            
-        return best_move
-
-    def _search_root(self, board: chess.Board, depth: int, alpha: int, beta: int) -> tuple['Optional[chess.Move]', int]:
-        """Root search with PVS and TT storage; returns (best_move, score)."""
-        best_move: 'Optional[chess.Move]' = None
-        max_score = -9999999
-        fen = board.fen()
-        moves = list(board.legal_moves)
-        moves = self._order_moves(board, moves, depth)
-        orig_alpha = alpha
-        for idx, move in enumerate(moves):
-            board.push(move)
-            if idx == 0:
-                score = -self.negamax(board, depth - 1, -beta, -alpha)
-            else:
-                score = -self.negamax(board, depth - 1, -(alpha + 1), -alpha)
-                if score > alpha:
-                    score = -self.negamax(board, depth - 1, -beta, -alpha)
-            board.pop()
-            if score > max_score:
-                max_score = score
-                best_move = move
-            alpha = max(alpha, score)
-            if alpha >= beta:
-                # Beta cutoff at root: still store killer/history for depth
-                self._store_killer(depth, move)
-                self._bump_history(move, depth)
-                break
-        # Store TT bound at root as well
-        flag = 'EXACT'
-        if max_score <= orig_alpha:
-            flag = 'UPPER'
-        elif max_score >= beta:
-            flag = 'LOWER'
-        self.transposition_table[fen] = (max_score, depth, flag, best_move.uci() if best_move else None)
-        # Log the final choice for learning when this call represents the final ID depth.
-        # The caller (choose_move) will call _search_root once per depth; only the last depth's
-        # returned best_move is logged before finalize_game.
-        return best_move, max_score
-
-    # ---- Move ordering and heuristics ----
-    def _order_moves(self, board: chess.Board, moves: list[chess.Move], depth: int) -> list[chess.Move]:
-        def score_move(m: chess.Move) -> int:
-            s = self._move_score(board, m)
-            # History heuristic
-            s += self.history.get(m.uci(), 0)
-            # Killer bonuses
-            killers = self.killers.get(depth, [])
-            if m.uci() in killers:
-                s += 10000
-            # TT best move bonus
-            try:
-                fen = board.fen()
-                entry = self.transposition_table.get(fen)
-                if entry and entry[3] == m.uci():
-                    s += 20000
-            except Exception:
-                pass
-            # Learned preference bonus (small)
-            if self.use_learning:
-                try:
-                    fen_key = board.fen().split(' ')[0]
-                    s += self._learn_bonus(fen_key, m.uci())
-                except Exception:
-                    pass
-            return s
-        return sorted(moves, key=score_move, reverse=True)
-
-    def _store_killer(self, depth: int, move: chess.Move) -> None:
-        try:
-            u = move.uci()
-            arr = self.killers.get(depth, [])
-            if u in arr:
-                return
-            if len(arr) < 2:
-                arr.append(u)
-            else:
-                arr[1] = arr[0]
-                arr[0] = u
-            self.killers[depth] = arr
-        except Exception:
-            pass
-
-    def _bump_history(self, move: chess.Move, depth: int) -> None:
-        try:
-            u = move.uci()
-            self.history[u] = self.history.get(u, 0) + depth * depth
-        except Exception:
-            pass
-
-    def choose_move_iterative(self, board: chess.Board, time_limit: float = 5.0) -> 'Optional[chess.Move]':
-        """Choose best move using iterative deepening with time limit.
-
-        Dynamically adapts maximum depth based on available time and branching.
-        """
-        import time
-        
-        # Check opening book first
-        position_fen = board.fen().split(' ')[0]
-        if position_fen in self.OPENING_BOOK:
-            book_moves = self.OPENING_BOOK[position_fen]
-            legal_book_moves = [move for move in book_moves if move in [m.uci() for m in board.legal_moves]]
-            if legal_book_moves:
-                chosen_uci = random.choice(legal_book_moves)
-                return chess.Move.from_uci(chosen_uci)
-        
-        start_time = time.time()
-        best_move = None
-        
-        # Iteratively deepen until time budget exhausted; cap at configured depth or 10
-        max_target = min(getattr(self, 'depth', 3), 10)
-        for depth in range(1, max_target + 1):
-            if time.time() - start_time >= time_limit:
-                break
-            
-            self.depth = depth
-            current_best = None
-            best_score = -9999999
-            alpha = -9999999
-            beta = 9999999
-            moves = list(board.legal_moves)
-            moves.sort(key=lambda m: self._move_score(board, m), reverse=True)
-            
-            for move in moves:
-                if time.time() - start_time >= time_limit:
-                    break
-                
-                board.push(move)
-                score = -self.negamax(board, depth - 1, -beta, -alpha)
-                board.pop()
-                
-                if score > best_score:
-                    best_score = score
-                    current_best = move
-                alpha = max(alpha, score)
-            
-            if current_best is not None:
-                best_move = current_best
-        
-        return best_move
-
-    def _move_score(self, board: chess.Board, move: chess.Move) -> int:
-        score = 0
-        if move.promotion is not None:
-            if move.promotion == chess.QUEEN:
-                score += 1200
-            else:
-                score += 900
-        try:
-            if board.is_capture(move):
-                if board.is_en_passant(move):
-                    victim_value = self.PIECE_VALUES[chess.PAWN]
-                else:
-                    victim_piece = board.piece_type_at(move.to_square)
-                    victim_value = self.PIECE_VALUES.get(victim_piece, 0) if victim_piece is not None else 0
-                score += 200 + victim_value
-        except Exception:
-            pass
-        try:
-            piece = board.piece_at(move.from_square)
-            if piece is not None and piece.piece_type == chess.KING:
-                from_file = chess.square_file(move.from_square)
-                to_file = chess.square_file(move.to_square)
-                if abs(from_file - to_file) == 2:
-                    score += 80
-        except Exception:
-            pass
-        try:
-            board.push(move)
-            if board.is_check():
-                score += 40
-            board.pop()
-        except Exception:
-            try:
-                board.pop()
-            except Exception:
-                pass
-        return score
-
-
-    
+from board_view import BoardView
+from constants import THEMES
+
+# Optional feature modules (config persistence, sound, clock)
+try:
+    from config_manager import ConfigManager
+    from sound_manager import SoundManager
+    from chess_clock import ChessClock
+    HAS_UPGRADES = True
+except Exception:
+    ConfigManager = None
+    SoundManager = None
+    ChessClock = None
+    HAS_UPGRADES = False
+
+# Pillow is imported on first use by load_piece_images() so startup does not
+# pay for its C extensions; tests may patch these module attributes directly.
+Image = None
+ImageTk = None
+
+# Keep only the newest lines in the verify log Listbox
+VERIFY_LOG_MAX = 200
 
 
 class GameController:
@@ -1085,6 +99,30 @@ class GameController:
         # UI update throttling for smoother high-speed AI
         self._last_ui_update = 0
         self._ui_update_interval = 0.05  # Minimum 50ms between UI updates
+        # Coalesced redraw requested via after_idle (see _request_redraw)
+        self._redraw_pending = False
+        self._redraw_force = False
+        # Pending after() id for the debounced depth slider
+        self._depth_after_id = None
+        # is_checkmate() results by position (see is_checkmate)
+        self._mate_cache: dict = {}
+        # Incremental SAN move list (see _sync_san_cache)
+        self._san_moves: list = []
+        self._san_cache: list = []
+        self._san_board = chess.Board()
+        self._san_source = None
+        # Ply to redraw the move list from when the cache was filled elsewhere (load_pgn)
+        self._san_redraw_from: Optional[int] = None
+        # PGN tree mirroring move_stack, extended on save (see _sync_pgn_game)
+        self._pgn_game = chess.pgn.Game()
+        self._pgn_node = self._pgn_game
+        self._pgn_moves: list = []
+        self._pgn_source = None
+        # (moves, Result header) of a loaded PGN; Result only stands while the moves match
+        self._pgn_loaded: Optional[tuple] = None
+        # Last engine path entry and its resolved absolute path (see verify_engine)
+        self._engine_path_last: Optional[str] = None
+        self._engine_resolved_path: Optional[str] = None
         # Training AI instance for headless mode
         self.training_ai = None
         
@@ -1113,7 +151,8 @@ class GameController:
             self.clock_enabled = False
 
         # build UI
-        self.status = tk.Label(master, text='White to move', font=('Arial', 12))
+        self.status_var = tk.StringVar(value='White to move')
+        self.status = tk.Label(master, textvariable=self.status_var, font=('Arial', 12))
         self.status.grid(row=0, column=0, columnspan=8)
         self.hints_label = tk.Label(master, text='', font=('Arial', 9), fg='#333333')
         self.hints_label.grid(row=1, column=0, columnspan=8)
@@ -1491,8 +530,8 @@ class GameController:
         tk.Button(converter_frame, text='Run Conversion', command=self.start_batch_conversion, font=('Arial', 8, 'bold')).pack(fill='x', padx=2, pady=3)
         tk.Label(converter_frame, textvariable=self.converter_status_var, font=('Arial', 8), fg='#333').pack(anchor='w', padx=2, pady=1)
 
-        self.load_piece_images()
-        self.load_overlay_icons()
+        # Pieces start as Unicode glyphs; PNG decoding runs in the background
+        self._load_images_async()
 
         # finalize
         self.update_board()
@@ -1524,6 +563,10 @@ class GameController:
             self.board_view.highlight(square)
             self.board_view.show_legal_moves(self.board, square)
         else:
+            if square == self.selected:
+                # Re-clicking the selected square: highlights are already shown.
+                # Selection is kept so a drag starting here still completes the move.
+                return
             move = None
             sel_piece = self.board.piece_at(self.selected)
             promotes = False
@@ -1536,7 +579,7 @@ class GameController:
                 promo = self.ask_promotion(sel_piece.color)
                 if promo is None:
                     self.selected = None
-                    self.update_board()
+                    self._request_redraw()
                     return
                 move = chess.Move(self.selected, square, promotion=promo)
             else:
@@ -1549,6 +592,9 @@ class GameController:
                 # Make the move
                 self.board.push(move)
                 self.move_history.append(move)
+                # Game-end state computed once; sounds, statistics and the AI trigger below all reuse it
+                outcome = self.board.outcome()
+                is_mate = outcome is not None and outcome.termination == chess.Termination.CHECKMATE
                 
                 # Store move for statistics
                 if self.config:
@@ -1560,7 +606,7 @@ class GameController:
                 
                 # Play sound effects
                 if self.sound:
-                    if self.board.is_checkmate():
+                    if is_mate:
                         self.sound.play('checkmate')
                     elif self.board.is_check():
                         self.sound.play('check')
@@ -1573,30 +619,33 @@ class GameController:
                 
                 self.selected = None
                 self.board_view.clear_highlights()
-                self.update_board()
-                self.master.update()
+                self._request_redraw()
+                # Flush pending redraws only; update() would re-enter the event loop
+                self.master.update_idletasks()
                 
                 # Update statistics if game over
-                if self.board.is_game_over() and self.config:
-                    if self.board.is_checkmate():
+                if outcome is not None and self.config:
+                    if is_mate:
                         winner = 'black' if self.board.turn == chess.WHITE else 'white'
                         self.config.update_statistics(winner)
                     else:
                         self.config.update_statistics('draw')
                 
-                if not self.board.is_game_over():
+                if outcome is None:
                     # Only trigger AI if in player vs AI mode AND game has started
                     if self.play_mode == 'player_vs_ai' and self.game_started:
                         self.ai_thinking = True  # Lock UI while AI thinks
-                        self.status.config(text='AI is thinking...')
+                        self.status_var.set('AI is thinking...')
                         self.master.config(cursor='watch')  # Change cursor to show waiting
                         # Capture depth before thread to avoid tkinter variable access issues
                         current_depth = max(1, self.depth_var.get())
-                        threading.Thread(target=self.run_ai_move, args=(current_depth,), daemon=True).start()
+                        # Spawn from the idle queue so this click handler returns first
+                        session_id = self._ai_session_id
+                        self.master.after_idle(lambda: self._start_ai_thread(current_depth, session_id))
             else:
                 if piece is not None and piece.color == self.board.turn:
                     self.selected = square
-                    self.update_board()
+                    self._request_redraw()
 
     def run_ai_move(self, depth: int | None = None):
         # Allow tests or callers to omit depth; fall back to current depth var or AI depth
@@ -1702,12 +751,18 @@ class GameController:
         if session_id == self._ai_session_id:
             self.master.after(0, self._finish_ai_move)
 
+    def _start_ai_thread(self, depth: int, session_id: int) -> None:
+        """Start the AI worker unless a new game began since it was scheduled."""
+        if session_id != self._ai_session_id:
+            return
+        threading.Thread(target=self.run_ai_move, args=(depth,), daemon=True).start()
+
     def _launch_ai_thread(self, depth: int | None = None) -> None:
         """Central helper to start an AI move thread if not already thinking."""
         if self.ai_thinking:
             return
         self.ai_thinking = True
-        self.status.config(text='AI is thinking...')
+        self.status_var.set('AI is thinking...')
         try:
             self.master.config(cursor='watch')
         except Exception:
@@ -1719,7 +774,7 @@ class GameController:
         try:
             self.ai_thinking = False  # Unlock UI after AI move
             self.master.config(cursor='')  # Reset cursor to default
-            self.update_board()
+            self._request_redraw()
             # Update metrics label
             try:
                 if hasattr(self, 'metrics_var') and hasattr(self.ai, 'last_move_metrics'):
@@ -1771,6 +826,95 @@ class GameController:
         except Exception as e:
             messagebox.showerror('Metrics', f'Failed to export metrics: {e}')
 
+    def _sync_san_cache(self) -> int:
+        """Bring the SAN cache in line with board.move_stack; returns the first changed ply."""
+        stack = self.board.move_stack
+        moves = self._san_moves
+        n = 0
+        if self.board is self._san_source:
+            limit = min(len(moves), len(stack))
+            while n < limit and moves[n] == stack[n]:
+                n += 1
+        if n == 0:
+            # New game / loaded position: restart from the board's own root
+            self._san_source = self.board
+            self._san_board = self.board.root()
+            moves.clear()
+            self._san_cache.clear()
+        else:
+            while len(moves) > n:
+                moves.pop()
+                self._san_cache.pop()
+                self._san_board.pop()
+        for mv in stack[n:]:
+            self._san_cache.append(self._san_board.san(mv))
+            self._san_board.push(mv)
+            moves.append(mv)
+        return n
+
+    def _sync_pgn_game(self) -> 'chess.pgn.Game':
+        """Bring the PGN tree in line with board.move_stack and return the game."""
+        stack = self.board.move_stack
+        moves = self._pgn_moves
+        if self.board is not self._pgn_source:
+            # New game: start a fresh tree, keeping a non-standard start position
+            self._pgn_source = self.board
+            self._pgn_game = chess.pgn.Game()
+            root = self.board.root()
+            if root.fen() != chess.STARTING_FEN:
+                self._pgn_game.setup(root)
+            self._pgn_node = self._pgn_game
+            self._pgn_loaded = None
+            moves.clear()
+        n = 0
+        limit = min(len(moves), len(stack))
+        while n < limit and moves[n] == stack[n]:
+            n += 1
+        # Drop undone moves, then append the new ones
+        while len(moves) > n:
+            moves.pop()
+            node = self._pgn_node
+            self._pgn_node = node.parent
+            self._pgn_node.variations.remove(node)
+        # New moves go first so the exported mainline is the board's game, not a loaded sideline
+        for mv in stack[n:]:
+            self._pgn_node = self._pgn_node.add_main_variation(mv)
+            moves.append(mv)
+        if self._pgn_loaded is not None:
+            loaded_moves, result = self._pgn_loaded
+            self._pgn_game.headers['Result'] = result if moves == loaded_moves else '*'
+        return self._pgn_game
+
+    def is_checkmate(self) -> bool:
+        """board.is_checkmate(), computed once per position.
+
+        Redraws and game-end bookkeeping ask again for an unchanged position;
+        the key covers pieces, side to move, castling and ep, which decide mate.
+        """
+        key = self.board._transposition_key()
+        mate = self._mate_cache.get(key)
+        if mate is None:
+            if len(self._mate_cache) >= 4096:
+                self._mate_cache.clear()
+            mate = self._mate_cache[key] = self.board.is_checkmate()
+        return mate
+
+    def _request_redraw(self, force=False):
+        """Schedule one update_board on the Tk idle queue; repeated requests coalesce."""
+        self._redraw_force = self._redraw_force or force
+        if self._redraw_pending:
+            return
+        self._redraw_pending = True
+        try:
+            self.master.after_idle(self._do_redraw)
+        except Exception:
+            self._do_redraw()
+
+    def _do_redraw(self):
+        force, self._redraw_force = self._redraw_force, False
+        self._redraw_pending = False
+        self.update_board(force=force)
+
     def update_board(self, force=False):
         # Throttle UI updates for smoother high-speed AI performance
         if not force:
@@ -1794,49 +938,47 @@ class GameController:
             king_square = self.board.king(self.board.turn)
             if king_square is not None:
                 try:
-                    self.board_view.canvases[king_square].configure(bg=CAPTURE_COLOR)
+                    self.board_view.set_square_color(king_square, CAPTURE_COLOR)
                 except Exception:
                     pass
 
             # Show all legal moves that get out of check with fixed legal move color
             try:
                 for move in self.board.legal_moves:
-                    to_square = move.to_square
-                    canvas = self.board_view.canvases.get(to_square)
-                    if canvas:
-                        canvas.configure(bg=LEGAL_MOVE_COLOR)
+                    self.board_view.set_square_color(move.to_square, LEGAL_MOVE_COLOR)
             except Exception:
                 pass
         
-        # update move list
-        self.move_list.delete(0, tk.END)
-        b = chess.Board()
-        san_moves = []
-        for mv in self.board.move_stack:
-            san_moves.append(b.san(mv))
-            b.push(mv)
-        for idx in range(0, len(san_moves), 2):
+        # update move list: only rows from the first changed ply are redrawn
+        first = self._sync_san_cache()
+        if self._san_redraw_from is not None:
+            first = min(first, self._san_redraw_from)
+            self._san_redraw_from = None
+        san_moves = self._san_cache
+        start = first - first % 2
+        self.move_list.delete(start // 2, tk.END)
+        for idx in range(start, len(san_moves), 2):
             n = idx // 2 + 1
             white = san_moves[idx]
             black = san_moves[idx + 1] if idx + 1 < len(san_moves) else ''
             self.move_list.insert(tk.END, f"{n}. {white} {black}")
         game_over_now = False
-        if self.board.is_checkmate():
+        if self.is_checkmate():
             winner = 'Black' if self.board.turn == chess.WHITE else 'White'
-            self.status.configure(text=f'Checkmate — {winner} wins')
+            self.status_var.set(f'Checkmate — {winner} wins')
             game_over_now = True
         elif self.board.is_stalemate():
-            self.status.configure(text='Stalemate — draw')
+            self.status_var.set('Stalemate — draw')
             game_over_now = True
         elif self.board.is_insufficient_material():
-            self.status.configure(text='Draw — insufficient material')
+            self.status_var.set('Draw — insufficient material')
             game_over_now = True
         else:
             turn = 'White' if self.board.turn == chess.WHITE else 'Black'
             if self.board.is_check():
-                self.status.configure(text=f'{turn} to move — CHECK!')
+                self.status_var.set(f'{turn} to move — CHECK!')
             else:
-                self.status.configure(text=f'{turn} to move')
+                self.status_var.set(f'{turn} to move')
         try:
             hints = self._special_hints()
             self.hints_label.configure(text=hints)
@@ -1852,7 +994,7 @@ class GameController:
             if game_over_now and hasattr(self, 'ai') and self.ai:
                 if not getattr(self, '_learn_finalized', False):
                     result = 'draw'
-                    if self.board.is_checkmate():
+                    if self.is_checkmate():
                         # If it's checkmate, current turn is the side that cannot move (was mated)
                         result = 'black' if self.board.turn == chess.WHITE else 'white'
                     self.ai.finalize_game(result)
@@ -1921,7 +1063,7 @@ class GameController:
             if not self.board.is_game_over():
                 current_depth = max(1, self.depth_var.get())
                 self.ai_thinking = True
-                self.status.config(text='AI is thinking...')
+                self.status_var.set('AI is thinking...')
                 self.master.config(cursor='watch')
                 threading.Thread(target=self.run_ai_move, args=(current_depth,), daemon=True).start()
         except Exception:
@@ -1930,7 +1072,7 @@ class GameController:
     def on_clock_timeout(self, is_white: bool) -> None:
         """Handle chess clock timeout."""
         winner = "Black" if is_white else "White"
-        self.status.configure(text=f"Time's up! {winner} wins on time")
+        self.status_var.set(f"Time's up! {winner} wins on time")
         messagebox.showinfo("Time's Up!", f"{winner} wins on time!")
         if self.config:
             result = 'black' if is_white else 'white'
@@ -2039,14 +1181,14 @@ class GameController:
                 # Start AI vs AI game
                 current_depth = max(1, self.depth_var.get())
                 self.ai_thinking = True
-                self.status.config(text='AI is thinking...')
+                self.status_var.set('AI is thinking...')
                 self.master.config(cursor='watch')
                 self._launch_ai_thread(current_depth)
             elif self.play_mode == 'player_vs_ai' and self.board.turn == chess.BLACK:
                 # If it's black's turn and black is AI, start AI move
                 current_depth = max(1, self.depth_var.get())
                 self.ai_thinking = True
-                self.status.config(text='AI is thinking...')
+                self.status_var.set('AI is thinking...')
                 self.master.config(cursor='watch')
                 self._launch_ai_thread(current_depth)
             elif self.play_mode == 'training_ai':
@@ -2085,7 +1227,7 @@ class GameController:
             self.training_ai.start()
             
             # Update UI
-            self.status.config(text='Training AI running (headless)...')
+            self.status_var.set('Training AI running (headless)...')
             self.game_started = True
             self._update_start_pause_button()
             # Begin polling to reflect progress in the status bar
@@ -2105,7 +1247,7 @@ class GameController:
                 self.training_ai = None
             
             # Update UI
-            self.status.config(text='Training AI stopped')
+            self.status_var.set('Training AI stopped')
             try:
                 if hasattr(self, 'training_stats_label'):
                     self.training_stats_label.config(text='Training stopped')
@@ -2125,7 +1267,7 @@ class GameController:
                 mv = int(getattr(self.training_ai, 'current_move_count', 0))
                 # Show current game's move count; games_played is completed games
                 txt = f"Training AI: games {g}  moves:{mv}  W:{res.get('white',0)} B:{res.get('black',0)} D:{res.get('draw',0)}"
-                self.status.config(text=txt)
+                self.status_var.set(txt)
                 try:
                     if hasattr(self, 'training_stats_label'):
                         self.training_stats_label.config(text=f"Games: {g} | Moves: {mv} | W:{res.get('white',0)} B:{res.get('black',0)} D:{res.get('draw',0)}")
@@ -2424,6 +1566,16 @@ class GameController:
             pass
 
     def on_depth_change(self, val):
+        """Debounce depth slider drags; apply the value once it settles (150ms)."""
+        try:
+            if self._depth_after_id is not None:
+                self.master.after_cancel(self._depth_after_id)
+            self._depth_after_id = self.master.after(150, self._apply_depth)
+        except Exception:
+            self._apply_depth()
+
+    def _apply_depth(self):
+        self._depth_after_id = None
         try:
             d = int(self.depth_var.get())
             self.ai.depth = max(1, d)
@@ -2431,6 +1583,31 @@ class GameController:
             pass
 
     def load_piece_images(self):
+        """Load piece images and overlay icons synchronously."""
+        self._install_images(*self._decode_images())
+
+    def _load_images_async(self):
+        """Decode the images on a worker thread, then install them from the Tk thread."""
+        def worker():
+            try:
+                pieces, icons = self._decode_images()
+                self.master.after(0, lambda: self._install_images(pieces, icons, redraw=True))
+            except Exception:
+                pass
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _decode_images(self):
+        """PIL images for pieces and overlay icons (either may be None).
+
+        Only Pillow work happens here, so it is safe off the Tk thread; the
+        PhotoImage wrappers are made in _install_images.
+        """
+        global Image, ImageTk
+        if Image is None or ImageTk is None:
+            try:
+                from PIL import Image, ImageTk  # type: ignore
+            except Exception:
+                return None, None
         assets_dir = os.path.join(os.path.dirname(__file__), 'assets')
         imgs = {}
         try:
@@ -2449,42 +1626,38 @@ class GameController:
                     continue
                 try:
                     im = Image.open(fname).convert('RGBA')
-                    im = im.resize((48, 48), Image.LANCZOS)
-                    imgs[sym] = ImageTk.PhotoImage(im)
+                    imgs[sym] = im.resize((48, 48), Image.LANCZOS)
                 except Exception:
                     imgs = {}
                     break
         except Exception:
             imgs = {}
-        if imgs:
-            self.piece_images = imgs
-        else:
+        if not imgs:
             # fallback: generate piece images programmatically
             try:
-                gen_imgs = image_generator.create_all_piece_images(48)
-                if gen_imgs and ImageTk:
-                    imgs = {}
-                    for sym, pil_img in gen_imgs.items():
-                        imgs[sym] = ImageTk.PhotoImage(pil_img)
-                    self.piece_images = imgs if imgs else None
-                else:
-                    self.piece_images = None
+                import image_generator
+                imgs = image_generator.create_all_piece_images(48)
             except Exception:
-                self.piece_images = None
+                imgs = {}
+        try:
+            import image_generator
+            icons = image_generator.create_overlay_icons(48)
+        except Exception:
+            icons = None
+        return imgs or None, icons or None
 
-    def load_overlay_icons(self):
-        """Load or generate overlay icons for special moves."""
+    def _install_images(self, pieces, icons, redraw=False):
+        """Wrap decoded images as PhotoImages (Tk thread only) and optionally redraw."""
         try:
-            gen_icons = image_generator.create_overlay_icons(48)
-            if gen_icons and ImageTk:
-                icons = {}
-                for icon_type, pil_img in gen_icons.items():
-                    icons[icon_type] = ImageTk.PhotoImage(pil_img)
-                self.overlay_icons = icons if icons else None
-            else:
-                self.overlay_icons = None
+            self.piece_images = {sym: ImageTk.PhotoImage(im) for sym, im in pieces.items()} if pieces and ImageTk else None
+        except Exception:
+            self.piece_images = None
+        try:
+            self.overlay_icons = {k: ImageTk.PhotoImage(im) for k, im in icons.items()} if icons and ImageTk else None
         except Exception:
             self.overlay_icons = None
+        if redraw:
+            self._request_redraw(force=True)
 
     def toggle_engine(self):
         if not self.engine_enabled:
@@ -2640,6 +1813,12 @@ class GameController:
     def update_controls_state(self):
         try:
             disabled = 'disabled' if self.board.is_game_over() else 'normal'
+            # Skip the configure calls when nothing that feeds them has changed
+            key = (disabled, getattr(self, '_download_in_progress', False),
+                   getattr(self, '_verify_in_progress', False))
+            if key == getattr(self, '_last_controls_state', None):
+                return
+            self._last_controls_state = key
             try:
                 self.depth_scale.configure(state=disabled)
             except Exception:
@@ -2649,11 +1828,11 @@ class GameController:
             except Exception:
                 pass
             try:
-                self.download_button.configure(state=disabled)
+                self.download_button.configure(state='disabled' if getattr(self, '_download_in_progress', False) else disabled)
             except Exception:
                 pass
             try:
-                self.verify_button.configure(state=disabled)
+                self.verify_button.configure(state='disabled' if getattr(self, '_verify_in_progress', False) else disabled)
             except Exception:
                 pass
             try:
@@ -2664,12 +1843,7 @@ class GameController:
             pass
 
     def save_pgn(self):
-        game = chess.pgn.Game()
-        node = game
-        b = chess.Board()
-        for mv in self.board.move_stack:
-            node = node.add_variation(mv)
-            b.push(mv)
+        game = self._sync_pgn_game()
         file = filedialog.asksaveasfilename(defaultextension='.pgn', filetypes=[('PGN files', '*.pgn')])
         if file:
             with open(file, 'w', encoding='utf-8') as f:
@@ -2696,12 +1870,7 @@ class GameController:
                 suffix = f"_{result}"
             out_path = os.path.join(autos_dir, f'game_{ts}{suffix}.pgn')
 
-            game = chess.pgn.Game()
-            node = game
-            b = chess.Board()
-            for mv in self.board.move_stack:
-                node = node.add_variation(mv)
-                b.push(mv)
+            game = self._sync_pgn_game()
             with open(out_path, 'w', encoding='utf-8') as f:
                 exporter = chess.pgn.FileExporter(f)
                 game.accept(exporter)
@@ -2729,11 +1898,25 @@ class GameController:
             if game is None:
                 messagebox.showerror('Error', 'No game found in PGN')
                 return
+            # One pass over the mainline fills the board and the SAN cache together
             board = game.board()
+            sans = []
             for mv in game.mainline_moves():
+                sans.append(board.san(mv))
                 board.push(mv)
             self.board = board
-            self.update_board(force=True)
+            self._san_source = board
+            self._san_board = board.copy()
+            self._san_moves = list(board.move_stack)
+            self._san_cache = sans
+            self._san_redraw_from = 0
+            # Keep the loaded tree (headers included) as the one save_pgn extends
+            self._pgn_source = board
+            self._pgn_game = game
+            self._pgn_node = game.end()
+            self._pgn_moves = list(board.move_stack)
+            self._pgn_loaded = (list(board.move_stack), game.headers.get('Result', '*'))
+            self._request_redraw(force=True)
         except Exception as e:
             messagebox.showerror('Error', f'Failed to load PGN: {e}')
 
@@ -2755,7 +1938,29 @@ class GameController:
         proceed = messagebox.askyesno('Download Stockfish', 'Download Stockfish release from GitHub releases?\nProceed?')
         if not proceed:
             return
-        found = self.engine_adapter.download_stockfish(prefer_platform=prefer, token=token)
+        self._download_in_progress = True
+        try:
+            self.download_button.configure(state='disabled')
+        except Exception:
+            pass
+
+        def worker():
+            # Network download and extraction run here; Tk is only touched via after()
+            try:
+                found = self.engine_adapter.download_stockfish(prefer_platform=prefer, token=token)
+            except Exception:
+                found = None
+            self.master.after(0, lambda: self._finish_download_engine(found))
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _finish_download_engine(self, found: 'Optional[str]') -> None:
+        """Called on main thread once the background download completes."""
+        self._download_in_progress = False
+        try:
+            self.download_button.configure(state='normal')
+        except Exception:
+            pass
+        self._last_controls_state = None  # button set directly; let the next update re-apply
         if not found:
             messagebox.showerror('Download failed', 'Failed to download or extract Stockfish — check network or token.')
             return
@@ -2770,9 +1975,17 @@ class GameController:
         if not path:
             messagebox.showerror('Verify failed', 'No engine path provided')
             return
-        if not os.path.exists(path) and shutil.which(path) is None:
+        # Resolve bare names against PATH once per distinct entry, not per attempt
+        if path == self._engine_path_last and self._engine_resolved_path:
+            resolved = self._engine_resolved_path
+        else:
+            resolved = os.path.abspath(path) if os.path.exists(path) else shutil.which(path)
+            self._engine_path_last = path
+            self._engine_resolved_path = resolved
+        if not resolved:
             messagebox.showerror('Verify failed', 'Engine executable not found')
             return
+        path = resolved
         vr = getattr(self, 'verify_retries', None)
         vt = getattr(self, 'verify_timeout', None)
         bm = getattr(self, 'backoff_max', None)
@@ -2787,20 +2000,109 @@ class GameController:
         prefer = platform_var.get() if platform_var is not None else 'auto'
         gh_token = getattr(self, 'github_token', None)
         token = gh_token.get().strip() if gh_token is not None else ''
-        ok, msg, found_path = self.engine_adapter.verify(path, retries=retries, timeout=timeout, auto_download=auto_dl, prefer_platform=prefer, backoff=strategy, max_wait=backoff, token=token)
+        self._verify_state = {
+            'path': path, 'retries': retries, 'timeout': timeout,
+            'auto_dl': auto_dl, 'prefer': prefer, 'token': token,
+            'tried_download': False, 'last_err': '',
+            'waits': self.engine_adapter.backoff_schedule(retries, strategy, backoff),
+            'log': getattr(self, 'verify_log', None), 'log_buf': [],
+        }
+        self._verify_in_progress = True
+        try:
+            self.verify_button.configure(state='disabled')
+        except Exception:
+            pass
+        self._verify_attempt(1)
+
+    def _verify_attempt(self, attempt: int) -> None:
+        """Run one verify attempt on a worker thread; engine start-up and any download block there, not Tk."""
+        st = self._verify_state
+        path = st['path']
+        download = st['auto_dl'] and not st['tried_download']
+
+        def worker():
+            try:
+                ok, msg = self.engine_adapter.verify_attempt(path, st['timeout'], probe=False)
+            except Exception as e:
+                ok, msg = False, str(e)
+            found = None
+            if not ok and download:
+                try:
+                    found = self.engine_adapter.download_stockfish(prefer_platform=st['prefer'], token=st['token'])
+                except Exception:
+                    found = None
+            self.master.after(0, lambda: self._verify_attempt_done(attempt, ok, msg, download, found))
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _verify_attempt_done(self, attempt: int, ok: bool, msg: str, downloaded: bool, found: 'Optional[str]') -> None:
+        """Main-thread half of a verify attempt: log, then finish or schedule the retry with after()."""
+        st = self._verify_state
+        if ok:
+            msg = f"{msg} (attempt {attempt}/{st['retries']})"
+            if msg.startswith('Engine responded'):
+                # Identity handshake spawns a second process; poll its Future instead of blocking here
+                self._poll_probe(self.engine_adapter.probe_identity_async(st['path']), msg, st['path'])
+            else:
+                self._finish_verify(True, msg, st['path'])
+            return
+        st['last_err'] = msg
+        st['log_buf'].append(f'Attempt {attempt}: {msg}')
+        if downloaded:
+            st['tried_download'] = True
+            if found:
+                st['path'] = found
+                st['log_buf'].append(f'Downloaded: {found}')
+        if attempt >= st['retries']:
+            self._finish_verify(False, f"Engine verification failed after {st['retries']} attempts: {st['last_err']}", None)
+            return
+        self._flush_verify_log()
+        wait = st['waits'][attempt - 1]
+        self.master.after(int(wait * 1000), lambda: self._verify_attempt(attempt + 1))
+
+    def _poll_probe(self, fut, msg: str, path: str) -> None:
+        if not fut.done():
+            self.master.after(50, lambda: self._poll_probe(fut, msg, path))
+            return
+        try:
+            info = fut.result()
+        except Exception:
+            info = ''
+        self._finish_verify(True, f'{msg} — {info}' if info else msg, path)
+
+    def _flush_verify_log(self) -> None:
+        """Append buffered verify messages to the log in one Tk call."""
+        st = self._verify_state
+        buf = st['log_buf']
+        log = st['log']
+        if buf and log is not None:
+            try:
+                log.insert(tk.END, *buf[-VERIFY_LOG_MAX:])
+                excess = log.size() - VERIFY_LOG_MAX
+                if excess > 0:
+                    log.delete(0, excess - 1)
+                log.see(tk.END)
+            except Exception:
+                pass
+        buf.clear()
+
+    def _finish_verify(self, ok: bool, msg: str, found_path: 'Optional[str]') -> None:
+        self._verify_in_progress = False
+        try:
+            self.verify_button.configure(state='normal')
+        except Exception:
+            pass
+        self._last_controls_state = None  # button set directly; let the next update re-apply
         if ok:
             if found_path:
                 var = getattr(self, 'engine_path_var', None)
                 if var is not None:
                     var.set(found_path)
+            self._verify_state['log_buf'].append(f'OK: {msg}')
+            self._flush_verify_log()
             messagebox.showinfo('Verify OK', msg)
-            vlog = getattr(self, 'verify_log', None)
-            if vlog is not None:
-                vlog.insert(tk.END, f'OK: {msg}')
         else:
-            vlog = getattr(self, 'verify_log', None)
-            if vlog is not None:
-                vlog.insert(tk.END, f'ERR: {msg}')
+            self._verify_state['log_buf'].append(f'ERR: {msg}')
+            self._flush_verify_log()
             messagebox.showerror('Verify failed', msg)
 
     # --- Batch PGN Converter UI callbacks ---
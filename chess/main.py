@@ -12,7 +12,19 @@ def run_gui() -> None:
     import tkinter as tk
     from game_controller import GameController
 
+    if sys.platform.startswith('win'):
+        # Per-monitor DPI awareness: Windows stops bitmap-scaling the whole window
+        try:
+            import ctypes
+            ctypes.windll.shcore.SetProcessDpiAwareness(1)
+        except Exception:
+            pass
     root = tk.Tk()
+    # Entry fields only hold paths/tokens; skip input-method (IME) event processing
+    try:
+        root.tk.call('tk', 'useinputmethods', '0')
+    except Exception:
+        pass
     app = GameController(root)
     root.mainloop()
 
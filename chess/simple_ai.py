@@ -5,6 +5,8 @@ from __future__ import annotations
 
 import chess  # type: ignore
 import chess.pgn  # type: ignore
+import chess.polyglot  # type: ignore
+import itertools
 import random
 import time
 import os
@@ -20,6 +22,81 @@ except Exception:
     def warn(*a, **k): pass
     def error(*a, **k): pass
 
+# Search bounds; kept strictly outside any real score (including mates)
+INF = 1_000_000_000
+NEG_INF = -INF
+MATE_SCORE = 9_999_999
+# Piece values indexed by piece type (chess.PAWN=1 .. chess.KING=6)
+_PV = (0, 100, 320, 330, 500, 900, 20000)
+
+# Polyglot Zobrist keys: piece keys as [color][piece_type][square], then castling/ep/turn
+_Z = chess.polyglot.POLYGLOT_RANDOM_ARRAY
+_Z_PIECE = tuple((None,) + tuple(tuple(_Z[64 * ((pt - 1) * 2 + color) + sq] for sq in range(64)) for pt in range(1, 7))
+                 for color in (0, 1))
+_Z_CASTLING = ((chess.BB_H1, _Z[768]), (chess.BB_A1, _Z[769]), (chess.BB_H8, _Z[770]), (chess.BB_A8, _Z[771]))
+
+
+def _mirrored(table: list) -> list:
+    """Piece-square table as seen from the other side (rank-flipped)."""
+    return [table[chess.square_mirror(sq)] for sq in chess.SQUARES]
+
+
+def _pawn_masks():
+    """Per-square bitboard masks for the pawn-structure terms, indexed [color][square]."""
+    adj = [(chess.BB_FILES[f-1] if f > 0 else 0) | (chess.BB_FILES[f+1] if f < 7 else 0) for f in range(8)]
+    ahead = {chess.WHITE: [], chess.BLACK: []}; behind = {chess.WHITE: [], chess.BLACK: []}
+    for sq in chess.SQUARES:
+        f = chess.square_file(sq); r = chess.square_rank(sq)
+        up = 0; down = 0
+        for rr in range(8):
+            if rr > r: up |= chess.BB_RANKS[rr]
+            if rr < r: down |= chess.BB_RANKS[rr]
+        span = adj[f] | chess.BB_FILES[f]
+        ahead[chess.WHITE].append(span & up); ahead[chess.BLACK].append(span & down)
+        behind[chess.WHITE].append(adj[f] & down); behind[chess.BLACK].append(adj[f] & up)
+    return adj, ahead, behind
+
+def _move_key(move: chess.Move) -> int:
+    """Compact int for a move (from, to, promotion) used by the TT, killers and history."""
+    return move.from_square | move.to_square << 6 | (move.promotion or 0) << 12
+
+
+# TT entries are one packed int instead of a (score, depth, flag, move) tuple:
+# bits 0-1 flag, 2-9 depth, 10-24 move key (0 = none), 26+ signed score
+_TT_EXACT, _TT_LOWER, _TT_UPPER = 0, 1, 2
+
+
+def _tt_pack(score: int, depth: int, flag: int, move_key: int = 0) -> int:
+    """Pack a transposition-table entry into a single int."""
+    return score << 26 | move_key << 10 | depth << 2 | flag
+
+
+def _position_key(board: chess.Board) -> int:
+    """Transposition-table key: EvalBoard keeps it incrementally, other boards hash in full."""
+    zobrist = getattr(board, 'zobrist', None)
+    return zobrist() if zobrist is not None else chess.polyglot.zobrist_hash(board)
+
+
+def _book_index(book: dict) -> dict:
+    """Opening book re-keyed by Polyglot Zobrist hash, the same key the search uses.
+
+    Moves are validated against their position once here and kept as Move
+    objects, so a probe needs no legality check.
+    """
+    index = {}
+    for fen, moves in book.items():
+        board = chess.Board(fen)
+        legal = [m for m in map(chess.Move.from_uci, moves) if board.is_legal(m)]
+        if legal: index[chess.polyglot.zobrist_hash(board)] = legal
+    return index
+
+# Adjacent-file masks, passed-pawn spans (own + adjacent files ahead) and
+# "friendly pawn behind on an adjacent file" masks for evaluate_pawn_structure
+_ADJ_FILES, _PASSED_SPAN, _BEHIND_ADJ = _pawn_masks()
+# f/g/h pawn-shield squares in front of a king castled short, for evaluate_king_safety
+_SHIELD_G1 = chess.BB_F2 | chess.BB_G2 | chess.BB_H2
+_SHIELD_G8 = chess.BB_F7 | chess.BB_G7 | chess.BB_H7
+
 # Original class definition copied verbatim (except removed surrounding comments)
 class SimpleAI:
     """
@@ -27,21 +104,28 @@ class SimpleAI:
     ==========================================
     (Documentation retained from original source.)
     """
-    PIECE_VALUES = {
-        chess.PAWN: 100,
-        chess.KNIGHT: 320,
-        chess.BISHOP: 330,
-        chess.ROOK: 500,
-        chess.QUEEN: 900,
-        chess.KING: 20000,
-    }
+    QUIESCENCE_MAX_PLY = 8  # captures searched past the nominal depth
     PAWN_TABLE = [0,0,0,0,0,0,0,0,50,50,50,50,50,50,50,50,10,10,20,30,30,20,10,10,5,5,10,27,27,10,5,5,0,0,0,25,25,0,0,0,5,-5,-10,0,0,-10,-5,5,5,10,10,-25,-25,10,10,5,0,0,0,0,0,0,0,0]
     KNIGHT_TABLE = [-50,-40,-30,-30,-30,-30,-40,-50,-40,-20,0,0,0,0,-20,-40,-30,0,10,15,15,10,0,-30,-30,5,15,20,20,15,5,-30,-30,0,15,20,20,15,0,-30,-30,5,10,15,15,10,5,-30,-40,-20,0,5,5,0,-20,-40,-50,-40,-30,-30,-30,-30,-40,-50]
     BISHOP_TABLE = [-20,-10,-10,-10,-10,-10,-10,-20,-10,0,0,0,0,0,0,-10,-10,0,5,10,10,5,0,-10,-10,5,5,10,10,5,5,-10,-10,0,10,10,10,10,0,-10,-10,10,10,10,10,10,10,-10,-10,5,0,0,0,0,5,-10,-20,-10,-10,-10,-10,-10,-10,-20]
-    ROOK_TABLE = [0,0,0,0,0,0,0,0,5,10,10,10,10,10,10,5,-5,0,0,0,0,0,0,-5,-5,0,0,0,0,0,0,-5,-5,0,0,0,0,0,0,-5,-5,0,0,0,0,0,0,-5,0,0,0,5,5,0,0,0]
+    ROOK_TABLE = [0,0,0,0,0,0,0,0,5,10,10,10,10,10,10,5,-5,0,0,0,0,0,0,-5,-5,0,0,0,0,0,0,-5,-5,0,0,0,0,0,0,-5,-5,0,0,0,0,0,0,-5,-5,0,0,0,0,0,0,-5,0,0,0,5,5,0,0,0]
     QUEEN_TABLE = [-20,-10,-10,-5,-5,-10,-10,-20,-10,0,0,0,0,0,0,-10,-10,0,5,5,5,5,0,-10,-5,0,5,5,5,5,0,-5,0,0,5,5,5,5,0,-5,-10,5,5,5,5,5,0,-10,-10,0,5,0,0,0,0,-10,-20,-10,-10,-5,-5,-10,-10,-20]
     KING_MIDDLEGAME_TABLE = [-30,-40,-40,-50,-50,-40,-40,-30,-30,-40,-40,-50,-50,-40,-40,-30,-30,-40,-40,-50,-50,-40,-40,-30,-30,-40,-40,-50,-50,-40,-40,-30,-20,-30,-30,-40,-40,-30,-30,-20,-10,-20,-20,-20,-20,-20,-20,-10,20,20,0,0,0,0,20,20,20,30,10,0,0,10,30,20]
     KING_ENDGAME_TABLE = [-50,-40,-30,-20,-20,-30,-40,-50,-30,-20,-10,0,0,-10,-20,-30,-30,-10,20,30,30,20,-10,-30,-30,-10,30,40,40,30,-10,-30,-30,-10,30,40,40,30,-10,-30,-30,-10,20,30,30,20,-10,-30,-30,-30,0,0,0,0,-30,-30,-50,-30,-30,-30,-30,-30,-30,-50]
+    # The tables above are laid out as printed (a8 first), i.e. indexed by square from
+    # black's side; white-side copies are pre-mirrored so evaluate() indexes both directly
+    PAWN_TABLE_WHITE = _mirrored(PAWN_TABLE)
+    KNIGHT_TABLE_WHITE = _mirrored(KNIGHT_TABLE)
+    BISHOP_TABLE_WHITE = _mirrored(BISHOP_TABLE)
+    ROOK_TABLE_WHITE = _mirrored(ROOK_TABLE)
+    QUEEN_TABLE_WHITE = _mirrored(QUEEN_TABLE)
+    KING_MIDDLEGAME_TABLE_WHITE = _mirrored(KING_MIDDLEGAME_TABLE)
+    KING_ENDGAME_TABLE_WHITE = _mirrored(KING_ENDGAME_TABLE)
+    # [endgame][color][piece_type] -> table, so a lookup is three indexes instead of an if/elif chain
+    _PST = (((None, PAWN_TABLE, KNIGHT_TABLE, BISHOP_TABLE, ROOK_TABLE, QUEEN_TABLE, KING_MIDDLEGAME_TABLE),
+             (None, PAWN_TABLE_WHITE, KNIGHT_TABLE_WHITE, BISHOP_TABLE_WHITE, ROOK_TABLE_WHITE, QUEEN_TABLE_WHITE, KING_MIDDLEGAME_TABLE_WHITE)),
+            ((None, PAWN_TABLE, KNIGHT_TABLE, BISHOP_TABLE, ROOK_TABLE, QUEEN_TABLE, KING_ENDGAME_TABLE),
+             (None, PAWN_TABLE_WHITE, KNIGHT_TABLE_WHITE, BISHOP_TABLE_WHITE, ROOK_TABLE_WHITE, QUEEN_TABLE_WHITE, KING_ENDGAME_TABLE_WHITE)))
     OPENING_BOOK = {
         "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1": ["e2e4","d2d4","c2c4","g1f3"],
         "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1": ["e7e5","c7c5","e7e6","c7c6"],
@@ -49,14 +133,25 @@ class SimpleAI:
         "rnbqkbnr/pppppppp/8/8/3P4/8/PPP1PPPP/RNBQKBNR b KQkq - 0 1": ["g8f6","d7d5","e7e6"],
         "rnbqkb1r/pppppppp/5n2/8/3P4/8/PPP1PPPP/RNBQKBNR w KQkq - 1 2": ["c2c4","g1f3"],
     }
+    # Book entries are full FENs; probing them by board placement never matched
+    _BOOK_INDEX = _book_index(OPENING_BOOK)
     def __init__(self, depth=3):
         self.depth = depth
         self.nodes_searched = 0
         self.last_move_metrics = {}
         self.transposition_table = {}
+        self.tt_max_entries = 200000  # cleared between searches once exceeded
+        # Static evals by Zobrist key for the current search; transpositions skip evaluate()
+        self.eval_cache = {}
+        # >1 splits root moves of deeper iterations across worker processes
+        self.root_workers = 1
+        self._root_pool = None
         self.killers = {}
         self.history = {}
         self.learning_db = {}
+        # fen_key -> moves with a learning record; see _learned_moves
+        self._learn_index = {}
+        self._learn_index_stamp = None
         self.game_log = []
         self._learning_path = os.path.join(os.path.dirname(__file__), 'ai_learn.json')
         self._learning_path_gz = self._learning_path + '.gz'
@@ -219,6 +314,19 @@ class SimpleAI:
             return out_path
         except Exception:
             return None
+    def _learned_moves(self, fen_key: str):
+        """Moves with a learning record in this position, or None (one dict probe per node).
+
+        The index is rebuilt whenever the learning DB is replaced or gains/loses keys.
+        """
+        db = self.learning_db; stamp = (id(db), len(db))
+        if self._learn_index_stamp != stamp:
+            index = {}
+            for key in db:
+                pos, _, mv = key.partition('|')
+                if mv: index.setdefault(pos, set()).add(mv)
+            self._learn_index = index; self._learn_index_stamp = stamp
+        return self._learn_index.get(fen_key)
     def _learn_bonus(self, fen_key: str, move_uci: str) -> int:
         try:
             rec = self.learning_db.get(fen_key+'|'+move_uci)
@@ -232,40 +340,51 @@ class SimpleAI:
         except Exception:
             return 0
     def game_phase(self, board: chess.Board) -> int:
-        total_material = sum(len(board.pieces(pt, chess.WHITE))+len(board.pieces(pt, chess.BLACK)) for pt in [chess.QUEEN,chess.ROOK,chess.BISHOP,chess.KNIGHT])
         if len(board.move_stack) < 10: return 0
-        elif total_material <= 6: return 2
+        # Non-pawn, non-king piece count for both sides in one popcount
+        total_material = (board.occupied & ~(board.pawns | board.kings)).bit_count()
+        if total_material <= 6: return 2
         else: return 1
     def get_piece_square_value(self, piece: chess.Piece, square: int, phase: int) -> int:
-        sq = square if piece.color == chess.WHITE else chess.square_mirror(square)
-        if piece.piece_type == chess.PAWN: return self.PAWN_TABLE[sq]
-        elif piece.piece_type == chess.KNIGHT: return self.KNIGHT_TABLE[sq]
-        elif piece.piece_type == chess.BISHOP: return self.BISHOP_TABLE[sq]
-        elif piece.piece_type == chess.ROOK: return self.ROOK_TABLE[sq]
-        elif piece.piece_type == chess.QUEEN: return self.QUEEN_TABLE[sq]
-        elif piece.piece_type == chess.KING: return self.KING_ENDGAME_TABLE[sq] if phase==2 else self.KING_MIDDLEGAME_TABLE[sq]
-        return 0
+        # White tables are pre-mirrored, so the square indexes either colour directly
+        return self._PST[phase == 2][piece.color][piece.piece_type][square]
     def evaluate(self, board: chess.Board) -> int:
-        if board.is_checkmate(): return -20000 if board.turn==chess.WHITE else 20000
-        if board.is_stalemate() or board.is_insufficient_material(): return 0
+        # One legal-move count serves mate/stalemate detection and mobility
+        own_moves = board.legal_moves.count()
+        if not own_moves: return -MATE_SCORE if board.is_check() else 0  # mated / stalemated
+        if board.is_insufficient_material(): return 0
         phase = self.game_phase(board); score = 0
-        for square in chess.SQUARES:
-            piece = board.piece_at(square)
-            if piece:
-                value = self.PIECE_VALUES[piece.piece_type]
-                pos_value = self.get_piece_square_value(piece, square, phase)
-                if piece.color == chess.WHITE: score += value + pos_value
-                else: score -= value + pos_value
-        score += self.evaluate_mobility(board)
+        pv = _PV  # local alias for the hot loop
+        white = board.occupied_co[chess.WHITE]; black = board.occupied_co[chess.BLACK]
+        mat = getattr(board, 'material', None)  # kept incrementally by EvalBoard
+        if phase == 2: king_w, king_b = self.KING_ENDGAME_TABLE_WHITE, self.KING_ENDGAME_TABLE
+        else: king_w, king_b = self.KING_MIDDLEGAME_TABLE_WHITE, self.KING_MIDDLEGAME_TABLE
+        for pt, bb, table_w, table_b in ((chess.PAWN, board.pawns, self.PAWN_TABLE_WHITE, self.PAWN_TABLE),
+                                         (chess.KNIGHT, board.knights, self.KNIGHT_TABLE_WHITE, self.KNIGHT_TABLE),
+                                         (chess.BISHOP, board.bishops, self.BISHOP_TABLE_WHITE, self.BISHOP_TABLE),
+                                         (chess.ROOK, board.rooks, self.ROOK_TABLE_WHITE, self.ROOK_TABLE),
+                                         (chess.QUEEN, board.queens, self.QUEEN_TABLE_WHITE, self.QUEEN_TABLE),
+                                         (chess.KING, board.kings, king_w, king_b)):
+            w = bb & white; b = bb & black
+            # Material straight from bitboard popcounts; PST only visits occupied squares
+            if mat is None: score += pv[pt] * (w.bit_count() - b.bit_count())
+            for sq in chess.scan_forward(w): score += table_w[sq]
+            for sq in chess.scan_forward(b): score -= table_b[sq]
+        if mat is not None: score += mat
+        score += self.evaluate_mobility(board, own_moves)
         score += self.evaluate_king_safety(board, chess.WHITE, phase)
         score -= self.evaluate_king_safety(board, chess.BLACK, phase)
         score += self.evaluate_pawn_structure(board, chess.WHITE)
         score -= self.evaluate_pawn_structure(board, chess.BLACK)
-        if len(board.pieces(chess.BISHOP, chess.WHITE)) >= 2: score += 30
-        if len(board.pieces(chess.BISHOP, chess.BLACK)) >= 2: score -= 30
+        if (board.bishops & white).bit_count() >= 2: score += 30
+        if (board.bishops & black).bit_count() >= 2: score -= 30
         return score if board.turn==chess.WHITE else -score
-    def evaluate_mobility(self, board: chess.Board) -> int:
-        current_turn = board.turn; board.turn = chess.WHITE; w = board.legal_moves.count(); board.turn = chess.BLACK; b = board.legal_moves.count(); board.turn = current_turn; return (w-b)*3
+    def evaluate_mobility(self, board: chess.Board, own_moves: Optional[int] = None) -> int:
+        # own_moves: legal-move count for the side to move, if the caller already has it
+        turn = board.turn
+        own = board.legal_moves.count() if own_moves is None else own_moves
+        board.turn = not turn; other = board.legal_moves.count(); board.turn = turn
+        return (own-other)*3 if turn == chess.WHITE else (other-own)*3
     def evaluate_king_safety(self, board: chess.Board, color: bool, phase: int) -> int:
         if phase == 2: return 0
         score = 0; king_square = board.king(color)
@@ -275,28 +394,22 @@ class SimpleAI:
         if color == chess.WHITE:
             if king_square in [chess.G1, chess.C1]:
                 score += 50
-                if king_square == chess.G1:
-                    for sq in [chess.F2, chess.G2, chess.H2]:
-                        p = board.piece_at(sq);
-                        if p and p.piece_type == chess.PAWN: score += 10
+                if king_square == chess.G1: score += 10 * (board.pawns & _SHIELD_G1).bit_count()
         else:
             if king_square in [chess.G8, chess.C8]:
                 score += 50
-                if king_square == chess.G8:
-                    for sq in [chess.F7, chess.G7, chess.H7]:
-                        p = board.piece_at(sq);
-                        if p and p.piece_type == chess.PAWN: score += 10
+                if king_square == chess.G8: score += 10 * (board.pawns & _SHIELD_G8).bit_count()
         return score
     def evaluate_pawn_structure(self, board: chess.Board, color: bool) -> int:
-        score = 0; pawns = board.pieces(chess.PAWN, color)
-        for pawn_square in pawns:
-            pawn_file = chess.square_file(pawn_square); pawn_rank = chess.square_rank(pawn_square)
-            if self.is_passed_pawn(board, pawn_square, color):
-                score += 20 + (pawn_rank*10) if color==chess.WHITE else 20 + ((7-pawn_rank)*10)
-            same_file = [sq for sq in pawns if chess.square_file(sq) == pawn_file]
-            if len(same_file) > 1: score -= 15
-            if self.is_isolated_pawn(board, pawn_square, color): score -= 20
-            if self.is_backward_pawn(board, pawn_square, color): score -= 10
+        # Bitboard masks replace the per-pawn scans over both pawn sets (same scores as the helpers below)
+        score = 0; pawns = board.pawns & board.occupied_co[color]; enemy = board.pawns & board.occupied_co[not color]
+        span = _PASSED_SPAN[color]; behind = _BEHIND_ADJ[color]; files = chess.BB_FILES
+        for sq in chess.scan_forward(pawns):
+            f = sq & 7; r = sq >> 3
+            if not enemy & span[sq]: score += 20 + (r*10 if color==chess.WHITE else (7-r)*10)
+            if (pawns & files[f]).bit_count() > 1: score -= 15
+            if not pawns & _ADJ_FILES[f]: score -= 20
+            if pawns & behind[sq]: score -= 10
         return score
     def is_passed_pawn(self, board: chess.Board, square: int, color: bool) -> bool:
         pawn_file = chess.square_file(square); pawn_rank = chess.square_rank(square); enemy_color = not color; enemy_pawns = board.pieces(chess.PAWN, enemy_color)
@@ -322,18 +435,22 @@ class SimpleAI:
                     if color==chess.WHITE and fp_rank < pawn_rank: return True
                     if color==chess.BLACK and fp_rank > pawn_rank: return True
         return False
-    def quiescence(self, board: chess.Board, alpha: int, beta: int) -> int:
+    def quiescence(self, board: chess.Board, alpha: int, beta: int, qdepth: int = 0) -> int:
         try:
             self.nodes_searched += 1
         except Exception:
             pass
-        stand_pat = self.evaluate(board)
+        key = _position_key(board); stand_pat = self.eval_cache.get(key)
+        if stand_pat is None: stand_pat = self.eval_cache[key] = self.evaluate(board)
         if stand_pat >= beta: return beta
         if alpha < stand_pat: alpha = stand_pat
-        capture_moves = [m for m in board.legal_moves if board.is_capture(m)]
-        capture_moves.sort(key=lambda m: self._move_score(board, m), reverse=True)
+        if qdepth >= self.QUIESCENCE_MAX_PLY: return alpha  # cap worst-case capture chains
+        # Generate only captures (incl. en passant) rather than filtering every legal move
+        capture_moves = list(board.generate_legal_captures())
+        mvv_lva = self._mvv_lva; capture_moves.sort(key=lambda m: mvv_lva(board, m), reverse=True)
+        push = board.push; pop = board.pop; qsearch = self.quiescence
         for move in capture_moves:
-            board.push(move); score = -self.quiescence(board, -beta, -alpha); board.pop()
+            push(move); score = -qsearch(board, -beta, -alpha, qdepth+1); pop()
             if score >= beta: return beta
             if score > alpha: alpha = score
         return alpha
@@ -342,72 +459,111 @@ class SimpleAI:
             self.nodes_searched += 1
         except Exception:
             pass
-        fen = board.fen()
-        if fen in self.transposition_table:
-            t_score, t_depth, t_flag, _ = self.transposition_table[fen]
-            if t_depth >= depth:
-                if t_flag == 'EXACT': return t_score
-                if t_flag == 'LOWER' and t_score >= beta: return t_score
-                if t_flag == 'UPPER' and t_score <= alpha: return t_score
-        if board.is_game_over():
-            score = -9999999 if board.is_checkmate() else 0
-            self.transposition_table[fen] = (score, depth, 'EXACT', None); return score
+        # Position key (pieces, side, castling, ep) — unlike fen() it ignores move counters, so transpositions hit
+        key = _position_key(board)
+        entry = self.transposition_table.get(key)
+        if entry is not None:
+            t_flag = entry & 3
+            if entry >> 2 & 0xff >= depth:
+                t_score = entry >> 26
+                if t_flag == _TT_EXACT: return t_score
+                # A bound that does not cut off still narrows the window searched below
+                if t_flag == _TT_LOWER:
+                    if t_score >= beta: return t_score
+                    if t_score > alpha: alpha = t_score
+                elif t_flag == _TT_UPPER:
+                    if t_score <= alpha: return t_score
+                    if t_score < beta: beta = t_score
+        # Only the cheap draw rules here; mate/stalemate show up as an empty move loop below
+        # (or in evaluate() at the leaves), so no extra legal-move generation per node
+        if board.is_insufficient_material() or board.halfmove_clock >= 150:
+            self.transposition_table[key] = _tt_pack(0, depth, _TT_EXACT); return 0
         if depth == 0:
-            score = self.quiescence(board, alpha, beta); self.transposition_table[fen] = (score, depth, 'EXACT', None); return score
-        max_score = -9999999; best_move = None; moves = list(board.legal_moves); moves = self._order_moves(board, moves, depth); orig_alpha = alpha
-        for idx, move in enumerate(moves):
-            pv = (idx == 0)
-            try:
-                is_capture = board.is_capture(move); gives_check = board.gives_check(move)
-            except Exception:
-                is_capture = False; gives_check = False
-            board.push(move)
+            # Quiescence is fail-hard, so a score on either bound is only a bound
+            score = self.quiescence(board, alpha, beta)
+            flag = _TT_UPPER if score <= alpha else (_TT_LOWER if score >= beta else _TT_EXACT)
+            if entry is None or entry >> 2 & 0xff <= depth: self.transposition_table[key] = _tt_pack(score, depth, flag)
+            return score
+        # Pseudo-legal moves, legality checked only for moves actually searched (cutoffs skip the rest)
+        max_score = NEG_INF; best_move = None; moves = list(board.generate_pseudo_legal_moves()); orig_alpha = alpha
+        # The TT move is searched before the rest are scored; if it cuts off, ordering is never paid for
+        tt_key = entry >> 10 & 0x7fff if entry is not None else 0
+        tt_move = None
+        if tt_key:
+            for m in moves:
+                if (m.from_square | m.to_square << 6 | (m.promotion or 0) << 12) == tt_key: tt_move = m; break
+        if tt_move is not None: moves = itertools.chain((tt_move,), self._ordered_rest(board, moves, depth, tt_move))
+        else: moves = self._order_moves(board, moves, depth)
+        idx = -1
+        # Bound methods hoisted once per node; the loop below runs them for every child
+        push = board.push; pop = board.pop; into_check = board.is_into_check; search = self.negamax
+        for move in moves:
+            if into_check(move): continue
+            idx += 1; pv = (idx == 0)
+            # LMR candidates only: the capture/check tests are skipped for moves that can't be reduced
+            reducible = depth >= 3 and idx >= 4 and move.promotion is None
+            if reducible:
+                try: reducible = not board.is_capture(move) and not board.gives_check(move)
+                except Exception: reducible = False
+            push(move)
             if pv:
-                score = -self.negamax(board, depth-1, -beta, -alpha)
+                score = -search(board, depth-1, -beta, -alpha)
             else:
-                reduction = 0
-                if depth >= 3 and not is_capture and not gives_check and move.promotion is None and idx >= 4:
-                    reduction = 1
-                d2 = max(1, depth-1-reduction)
-                score = -self.negamax(board, d2, -(alpha+1), -alpha)
+                reduction = 1 if reducible else 0
+                d2 = depth-1-reduction  # reduction only applies at depth >= 3, so d2 >= 1 there
+                score = -search(board, d2, -(alpha+1), -alpha)
                 if score > alpha:
-                    score = -self.negamax(board, depth-1, -beta, -alpha)
-            board.pop()
+                    score = -search(board, depth-1, -beta, -alpha)
+            pop()
             if score > max_score: max_score = score; best_move = move
-            alpha = max(alpha, score)
+            if score > alpha: alpha = score
             if alpha >= beta:
-                self._store_killer(depth, move); self._bump_history(move, depth); break
-        flag = 'EXACT'
-        if max_score <= orig_alpha: flag = 'UPPER'
-        elif max_score >= beta: flag = 'LOWER'
-        self.transposition_table[fen] = (max_score, depth, flag, best_move.uci() if best_move else None)
+                # Captures are already ordered by MVV-LVA; only quiet cutoffs feed killers/history
+                if not board.is_capture(move): self._store_killer(board.ply(), move); self._bump_history(move, depth)
+                break
+        if idx < 0:
+            # No legal move: checkmate or stalemate
+            score = -MATE_SCORE if board.is_check() else 0
+            self.transposition_table[key] = _tt_pack(score, depth, _TT_EXACT); return score
+        flag = _TT_EXACT
+        if max_score <= orig_alpha: flag = _TT_UPPER
+        elif max_score >= beta: flag = _TT_LOWER
+        # Depth-preferred replacement: keep a deeper entry over this shallower result
+        if entry is None or entry >> 2 & 0xff <= depth: self.transposition_table[key] = _tt_pack(max_score, depth, flag, _move_key(best_move) if best_move else 0)
         return max_score
+    def _book_move(self, board: chess.Board) -> Optional[chess.Move]:
+        """Random legal opening-book move for this position (recording book metrics), or None."""
+        book_moves = self._BOOK_INDEX.get(_position_key(board))
+        if not book_moves: return None
+        chosen = random.choice(book_moves)  # validated when the index was built
+        self.last_move_metrics = {
+            'move': chosen.uci(),
+            'depth': 0,
+            'nodes': 0,
+            'branching': board.legal_moves.count(),
+            'time': 0.0,
+            'source': 'book'
+        }
+        return chosen
     def choose_move(self, board: chess.Board) -> Optional[chess.Move]:
-        position_fen = board.fen().split(' ')[0]
-        if position_fen in self.OPENING_BOOK:
-            book_moves = self.OPENING_BOOK[position_fen]
-            legal_book_moves = [mv for mv in book_moves if mv in [m.uci() for m in board.legal_moves]]
-            if legal_book_moves:
-                chosen = chess.Move.from_uci(random.choice(legal_book_moves))
-                self.last_move_metrics = {
-                    'move': chosen.uci(),
-                    'depth': 0,
-                    'nodes': 0,
-                    'branching': len(list(board.legal_moves)),
-                    'time': 0.0,
-                    'source': 'book'
-                }
-                return chosen
+        book_move = self._book_move(board)
+        if book_move is not None: return book_move
+        board = EvalBoard.from_board(board)
+        if len(self.transposition_table) > self.tt_max_entries: self.transposition_table.clear()
+        self.eval_cache.clear()
         start_time = time.time(); self.nodes_searched = 0
-        best_move = None; prev_score = 0; root_branching = len(list(board.legal_moves))
+        best_move = None; prev_score = 0
+        # Root moves generated once; every iteration and re-search only re-orders them
+        root_moves = list(board.generate_legal_moves()); root_branching = len(root_moves)
         for d in range(1, max(1, self.depth)+1):
             window = 30 + d*10
-            alpha = max(-9999999, prev_score - window); beta = min(9999999, prev_score + window)
-            move_d, score_d = self._search_root(board, d, alpha, beta)
+            alpha = max(NEG_INF, prev_score - window); beta = min(INF, prev_score + window)
+            search = self._search_root_parallel if self.root_workers > 1 and d >= 3 else self._search_root
+            move_d, score_d = search(board, d, alpha, beta, root_moves)
             if move_d is not None and score_d <= alpha:
-                move_d, score_d = self._search_root(board, d, -9999999, beta)
+                move_d, score_d = search(board, d, NEG_INF, beta, root_moves)
             elif move_d is not None and score_d >= beta:
-                move_d, score_d = self._search_root(board, d, alpha, 9999999)
+                move_d, score_d = search(board, d, alpha, INF, root_moves)
             if move_d is not None:
                 best_move, prev_score = move_d, score_d
         if best_move is not None:
@@ -428,8 +584,9 @@ class SimpleAI:
             except Exception:
                 pass
         return best_move
-    def _search_root(self, board: chess.Board, depth: int, alpha: int, beta: int):
-        best_move = None; max_score = -9999999; fen = board.fen(); moves = list(board.legal_moves); moves = self._order_moves(board, moves, depth); orig_alpha = alpha
+    def _search_root(self, board: chess.Board, depth: int, alpha: int, beta: int, root_moves: Optional[list] = None):
+        if root_moves is None: root_moves = list(board.generate_legal_moves())
+        best_move = None; max_score = NEG_INF; key = _position_key(board); moves = self._order_moves(board, root_moves, depth); orig_alpha = alpha
         for idx, move in enumerate(moves):
             board.push(move)
             if idx == 0:
@@ -442,61 +599,99 @@ class SimpleAI:
             if score > max_score: max_score = score; best_move = move
             alpha = max(alpha, score)
             if alpha >= beta:
-                self._store_killer(depth, move); self._bump_history(move, depth); break
-        flag = 'EXACT'
-        if max_score <= orig_alpha: flag = 'UPPER'
-        elif max_score >= beta: flag = 'LOWER'
-        self.transposition_table[fen] = (max_score, depth, flag, best_move.uci() if best_move else None)
+                # Captures are already ordered by MVV-LVA; only quiet cutoffs feed killers/history
+                if not board.is_capture(move): self._store_killer(board.ply(), move); self._bump_history(move, depth)
+                break
+        flag = _TT_EXACT
+        if max_score <= orig_alpha: flag = _TT_UPPER
+        elif max_score >= beta: flag = _TT_LOWER
+        self.transposition_table[key] = _tt_pack(max_score, depth, flag, _move_key(best_move) if best_move else 0)
+        return best_move, max_score
+    def _search_root_parallel(self, board: chess.Board, depth: int, alpha: int, beta: int, root_moves: Optional[list] = None):
+        """Root splitting: search each root move in a worker process with the full window.
+
+        Workers cannot share alpha, so there is less pruning than the serial
+        PVS loop, but the children run concurrently.
+        """
+        import concurrent.futures
+        if self._root_pool is None:
+            self._root_pool = concurrent.futures.ProcessPoolExecutor(max_workers=self.root_workers)
+        if root_moves is None: root_moves = list(board.generate_legal_moves())
+        moves = self._order_moves(board, root_moves, depth)
+        root_fen = board.root().fen(); stack = [m.uci() for m in board.move_stack]
+        futures = [self._root_pool.submit(_root_child_search, root_fen, stack, m.uci(), depth-1, -beta, -alpha) for m in moves]
+        best_move = None; max_score = NEG_INF
+        for move, fut in zip(moves, futures):
+            child_score, nodes = fut.result()
+            self.nodes_searched += nodes
+            score = -child_score
+            if score > max_score: max_score = score; best_move = move
+        flag = _TT_EXACT
+        if max_score <= alpha: flag = _TT_UPPER
+        elif max_score >= beta: flag = _TT_LOWER
+        self.transposition_table[_position_key(board)] = _tt_pack(max_score, depth, flag, _move_key(best_move) if best_move else 0)
         return best_move, max_score
+    def shutdown_root_pool(self) -> None:
+        if self._root_pool is not None:
+            try: self._root_pool.shutdown(wait=False, cancel_futures=True)
+            except Exception: pass
+            self._root_pool = None
     def _order_moves(self, board: chess.Board, moves: list[chess.Move], depth: int) -> list[chess.Move]:
-        def score_move(m: chess.Move) -> int:
-            s = self._move_score(board, m) + self.history.get(m.uci(),0)
-            killers = self.killers.get(depth, [])
-            if m.uci() in killers: s += 10000
-            try:
-                fen = board.fen(); entry = self.transposition_table.get(fen)
-                if entry and entry[3] == m.uci(): s += 20000
+        # Per-node invariants: TT/PV move, killers and learning key are looked up once, not per move
+        entry = self.transposition_table.get(_position_key(board))
+        tt_move = entry >> 10 & 0x7fff if entry is not None else 0
+        # Killers are keyed by game ply, so they carry over between iterations and moves
+        killers = self.killers.get(board.ply(), ()); history = self.history; move_score = self._move_score
+        fen_key = None; learned = None
+        if self.use_learning:
+            try: fen_key = board.board_fen(); learned = self._learned_moves(fen_key)
             except Exception: pass
-            if self.use_learning:
-                try:
-                    fen_key = board.fen().split(' ')[0]; s += self._learn_bonus(fen_key, m.uci())
-                except Exception: pass
+        def score_move(m: chess.Move) -> int:
+            # Int key built inline: no uci() string formatting per move
+            k = m.from_square | m.to_square << 6 | (m.promotion or 0) << 12
+            s = move_score(board, m) + history.get(k,0)
+            if k == tt_move: s += 20000  # previous iteration's best (PV) move first
+            elif k in killers: s += 10000
+            if learned:
+                u = m.uci()
+                if u in learned:
+                    try: s += self._learn_bonus(fen_key, u)
+                    except Exception: pass
             return s
         return sorted(moves, key=score_move, reverse=True)
-    def _store_killer(self, depth: int, move: chess.Move) -> None:
+    def _ordered_rest(self, board: chess.Board, moves: list[chess.Move], depth: int, first: chess.Move):
+        """Ordered moves other than first, scored only once the caller asks for the second move."""
+        for m in self._order_moves(board, moves, depth):
+            if m != first: yield m
+    def _store_killer(self, ply: int, move: chess.Move) -> None:
         try:
-            u = move.uci(); arr = self.killers.get(depth, [])
+            u = _move_key(move); arr = self.killers.get(ply, [])
             if u in arr: return
             if len(arr) < 2: arr.append(u)
             else: arr[1] = arr[0]; arr[0] = u
-            self.killers[depth] = arr
+            self.killers[ply] = arr
         except Exception: pass
     def _bump_history(self, move: chess.Move, depth: int) -> None:
         try:
-            u = move.uci(); self.history[u] = self.history.get(u,0) + depth*depth
+            k = _move_key(move); self.history[k] = self.history.get(k,0) + depth*depth
         except Exception: pass
     def choose_move_iterative(self, board: chess.Board, time_limit: float = 5.0) -> Optional[chess.Move]:
-        position_fen = board.fen().split(' ')[0]
-        if position_fen in self.OPENING_BOOK:
-            book_moves = self.OPENING_BOOK[position_fen]
-            legal_book_moves = [mv for mv in book_moves if mv in [m.uci() for m in board.legal_moves]]
-            if legal_book_moves:
-                chosen = chess.Move.from_uci(random.choice(legal_book_moves))
-                self.last_move_metrics = {
-                    'move': chosen.uci(),
-                    'depth': 0,
-                    'nodes': 0,
-                    'branching': len(list(board.legal_moves)),
-                    'time': 0.0,
-                    'source': 'book'
-                }
-                return chosen
+        book_move = self._book_move(board)
+        if book_move is not None: return book_move
+        board = EvalBoard.from_board(board)
+        if len(self.transposition_table) > self.tt_max_entries: self.transposition_table.clear()
+        self.eval_cache.clear()
         start_time = time.time(); self.nodes_searched = 0; best_move = None; max_target = min(getattr(self,'depth',3), 10)
-        root_branching = len(list(board.legal_moves))
+        # Root moves generated once; each iteration only re-sorts them
+        root_moves = list(board.generate_legal_moves()); root_branching = len(root_moves)
+        reached = 0
         for depth in range(1, max_target+1):
             if time.time() - start_time >= time_limit: break
-            self.depth = depth; current_best = None; best_score = -9999999; alpha = -9999999; beta = 9999999
-            moves = list(board.legal_moves); moves.sort(key=lambda m: self._move_score(board, m), reverse=True)
+            current_best = None; best_score = NEG_INF; alpha = NEG_INF; beta = INF
+            moves = sorted(root_moves, key=lambda m: self._move_score(board, m), reverse=True)
+            # Previous iteration's best goes first: best ordering, and a cut-short iteration still covers it
+            if best_move in moves: moves.remove(best_move); moves.insert(0, best_move)
+            reached = depth
             for move in moves:
                 if time.time() - start_time >= time_limit: break
                 board.push(move); score = -self.negamax(board, depth-1, -beta, -alpha); board.pop()
@@ -507,38 +702,172 @@ class SimpleAI:
         if best_move is not None:
             self.last_move_metrics = {
                 'move': best_move.uci(),
-                'depth': self.depth,
+                'depth': reached,
                 'nodes': self.nodes_searched,
                 'branching': root_branching,
                 'time': elapsed,
                 'source': 'iterative'
             }
             try:
-                info(f"AI metrics: move={best_move.uci()} depth={self.depth} nodes={self.nodes_searched} branching={root_branching} time={elapsed:.3f}s")
+                info(f"AI metrics: move={best_move.uci()} depth={reached} nodes={self.nodes_searched} branching={root_branching} time={elapsed:.3f}s")
             except Exception:
                 pass
         return best_move
-    def _move_score(self, board: chess.Board, move: chess.Move) -> int:
+    # Module tables bound as default arguments: these run once per generated move,
+    # and a default is a fast local load instead of a global + attribute lookup
+    def _mvv_lva(self, board: chess.Board, move: chess.Move, pv=_PV) -> int:
+        # Capture-only ordering key for quiescence: most valuable victim, then least valuable attacker
+        victim = board.piece_type_at(move.to_square) or chess.PAWN  # empty target = en passant
+        return 10 * pv[victim] - (board.piece_type_at(move.from_square) or 0) + (1200 if move.promotion == chess.QUEEN else 0)
+    def _move_score(self, board: chess.Board, move: chess.Move, pv=_PV, _bb_squares=chess.BB_SQUARES, _file=chess.square_file) -> int:
         score = 0
         if move.promotion is not None:
             score += 1200 if move.promotion == chess.QUEEN else 900
         try:
-            if board.is_capture(move):
-                if board.is_en_passant(move): victim_value = self.PIECE_VALUES[chess.PAWN]
-                else:
-                    victim_piece = board.piece_type_at(move.to_square); victim_value = self.PIECE_VALUES.get(victim_piece,0) if victim_piece is not None else 0
-                score += 200 + victim_value
+            # Capture test straight from bitboards (is_capture + is_en_passant redo the same work)
+            to_sq = move.to_square
+            attacker = board.piece_type_at(move.from_square) or 0
+            victim_value = None
+            if _bb_squares[to_sq] & board.occupied_co[not board.turn]:
+                victim_value = pv[board.piece_type_at(to_sq)]
+            elif to_sq == board.ep_square and attacker == chess.PAWN:
+                victim_value = pv[chess.PAWN]
+            if victim_value is not None:
+                # MVV-LVA: victim value dominates, cheaper attacker (piece type 1..6) breaks ties;
+                # captures that don't lose material sort ahead of killer moves
+                score += 200 + victim_value - attacker
+                if victim_value >= pv[attacker]: score += 15000
+            if attacker == chess.KING and abs(_file(move.from_square) - _file(to_sq)) == 2: score += 80
+            # Positional delta of the moving piece, from the side-to-move's middlegame tables
+            if attacker: table = self._PST[0][board.turn][attacker]; score += table[to_sq] - table[move.from_square]
         except Exception: pass
         try:
-            piece = board.piece_at(move.from_square)
-            if piece is not None and piece.piece_type == chess.KING:
-                if abs(chess.square_file(move.from_square) - chess.square_file(move.to_square)) == 2: score += 80
+            if board.gives_check(move): score += 40
         except Exception: pass
-        try:
-            board.push(move)
-            if board.is_check(): score += 40
-            board.pop()
-        except Exception:
-            try: board.pop()
-            except Exception: pass
         return score
+
+
+_worker_ai: Optional[SimpleAI] = None
+# (root_fen, stack, board) of the last root position this worker rebuilt; every
+# root move of an iteration shares it, so the FEN is parsed once per worker, not per task
+_worker_root = None
+
+
+def _root_child_search(root_fen: str, stack: list, move_uci: str, depth: int, alpha: int, beta: int):
+    """Process-pool worker for SimpleAI._search_root_parallel; returns (score, nodes)."""
+    global _worker_ai, _worker_root
+    if _worker_ai is None:
+        _worker_ai = SimpleAI(depth=depth + 1)
+        _worker_ai.use_learning = False  # ordering only; skip per-move learning lookups
+    if _worker_root is None or _worker_root[0] != root_fen or _worker_root[1] != stack:
+        board = EvalBoard(root_fen)
+        for u in stack:
+            board.push(chess.Move.from_uci(u))
+        _worker_root = (root_fen, stack, board)
+    board = _worker_root[2]
+    board.push(chess.Move.from_uci(move_uci))
+    _worker_ai.nodes_searched = 0
+    try:
+        score = _worker_ai.negamax(board, depth, alpha, beta)
+    finally:
+        board.pop()
+    return score, _worker_ai.nodes_searched
+
+
+class EvalBoard(chess.Board):
+    """Board that keeps white-minus-black material and the Zobrist piece hash current across push/pop.
+
+    Only push()/pop() update ``material`` and the hash; build one with from_board()
+    and use it for search, not for editing positions (set_fen etc. are not tracked).
+    """
+    def __init__(self, *args, **kwargs):
+        self._eval_stack = []
+        super().__init__(*args, **kwargs)
+        self.material = self._scan_material()
+        self._piece_hash = self._scan_hash()
+
+    def _scan_material(self) -> int:
+        pv = _PV
+        white = self.occupied_co[chess.WHITE]; black = self.occupied_co[chess.BLACK]
+        return sum(pv[pt] * ((bb & white).bit_count() - (bb & black).bit_count())
+                   for pt, bb in ((chess.PAWN, self.pawns), (chess.KNIGHT, self.knights), (chess.BISHOP, self.bishops),
+                                  (chess.ROOK, self.rooks), (chess.QUEEN, self.queens), (chess.KING, self.kings)))
+
+    def _scan_hash(self) -> int:
+        # Piece part of the Polyglot hash, walked per piece-type bitboard: no piece_type_at() per square
+        h = 0
+        for color in (chess.WHITE, chess.BLACK):
+            own = self.occupied_co[color]; keys = _Z_PIECE[color]
+            for pt, bb in ((chess.PAWN, self.pawns), (chess.KNIGHT, self.knights), (chess.BISHOP, self.bishops),
+                           (chess.ROOK, self.rooks), (chess.QUEEN, self.queens), (chess.KING, self.kings)):
+                z = keys[pt]
+                for sq in chess.scan_forward(bb & own): h ^= z[sq]
+        return h
+
+    @classmethod
+    def from_board(cls, board: chess.Board) -> 'EvalBoard':
+        """Copy board (including its move stack) into an EvalBoard."""
+        if isinstance(board, cls):
+            return board.copy()
+        b = cls(board.root().fen(), chess960=board.chess960)
+        for move in board.move_stack:
+            b.push(move)
+        return b
+
+    def copy(self, *, stack=True):
+        b = super().copy(stack=stack)
+        b.material = self.material
+        b._piece_hash = self._piece_hash
+        if stack is True:
+            b._eval_stack = list(self._eval_stack)
+        else:
+            b._eval_stack = self._eval_stack[-stack:] if stack else []
+        return b
+
+    def zobrist(self) -> int:
+        """Polyglot Zobrist hash (same value as chess.polyglot.zobrist_hash for standard chess)."""
+        h = self._piece_hash
+        castling = self.clean_castling_rights()
+        if castling:
+            for bb, key in _Z_CASTLING:
+                if castling & bb: h ^= key
+        ep = self.ep_square
+        if ep:
+            # Only when a pawn stands ready to capture, as Polyglot defines it
+            mask = chess.shift_down(chess.BB_SQUARES[ep]) if self.turn else chess.shift_up(chess.BB_SQUARES[ep])
+            if (chess.shift_left(mask) | chess.shift_right(mask)) & self.pawns & self.occupied_co[self.turn]:
+                h ^= _Z[772 + (ep & 7)]
+        if self.turn: h ^= _Z[780]
+        return h
+
+    def push(self, move: chess.Move) -> None:
+        self._eval_stack.append((self.material, self._piece_hash))
+        if move:
+            # XOR the touched squares out of/into the piece hash; material moves with captures/promotions
+            turn = self.turn; frm = move.from_square; to = move.to_square
+            own = _Z_PIECE[turn]; pt = self.piece_type_at(frm)
+            h = own[pt][frm]; delta = 0
+            own_rook = chess.BB_SQUARES[to] & self.rooks & self.occupied_co[turn]
+            if pt == chess.KING and (own_rook or abs((frm & 7) - (to & 7)) > 1):
+                # Castling, as king-to-g/c-file (standard) or king-takes-rook (Chess960)
+                back = frm & ~7; kingside = (to & 7) > (frm & 7)
+                rook_from = to if own_rook else back + (7 if kingside else 0)
+                h ^= own[chess.KING][back + (6 if kingside else 2)] ^ own[chess.ROOK][rook_from] ^ own[chess.ROOK][back + (5 if kingside else 3)]
+            else:
+                opp = _Z_PIECE[not turn]; captured = self.piece_type_at(to)
+                if captured:
+                    h ^= opp[captured][to]; delta = _PV[captured]
+                elif pt == chess.PAWN and to == self.ep_square and (frm & 7) != (to & 7):
+                    h ^= opp[chess.PAWN][to - 8 if turn else to + 8]; delta = _PV[chess.PAWN]
+                if move.promotion:
+                    h ^= own[move.promotion][to]; delta += _PV[move.promotion] - _PV[chess.PAWN]
+                else:
+                    h ^= own[pt][to]
+            self.material += delta if turn else -delta
+            self._piece_hash ^= h
+        super().push(move)
+
+    def pop(self) -> chess.Move:
+        move = super().pop()
+        self.material, self._piece_hash = self._eval_stack.pop()
+        return move
@@ -1,11 +1,9 @@
-import os, json, unittest, importlib.util, tempfile, shutil
+import os, sys, json, unittest, tempfile, shutil
 
-# Dynamically load converter module
-ROOT = os.path.dirname(os.path.dirname(__file__))
-CONVERTER_PATH = os.path.join(ROOT, 'tools', 'batch_pgn_converter.py')
-spec = importlib.util.spec_from_file_location('batch_pgn_converter', CONVERTER_PATH)
-mod = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(mod)
+# Import the converter by name from tools/ so spawn-started pool workers can import it too
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'tools'))
+import batch_pgn_converter as mod
 
 SAMPLE_PGN_SINGLE = """[Event "Single"]\n[Site "Local"]\n[Date "2025.11.15"]\n[Round "1"]\n[White "A"]\n[Black "B"]\n[Result "1-0"]\n\n1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 4. Ba4 Nf6 5. O-O Be7 6. Re1 O-O 7. c3 d5 8. exd5 Nxd5 9. Nxe5 Nxe5 10. Rxe5 Nf4 11. d4 Bd6 12. Bxf4 1-0\n"""
 SAMPLE_PGN_MULTI = """[Event "G1"]\n[Site "Local"]\n[Date "2025.11.15"]\n[Round "1"]\n[White "A"]\n[Black "B"]\n[Result "1-0"]\n\n1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 4. Ba4 Nf6 5. O-O Be7 6. Re1 O-O 7. c3 d5 8. exd5 Nxd5 9. Nxe5 Nxe5 10. Rxe5 Nf4 11. d4 Bd6 12. Bxf4 1-0\n\n[Event "G2"]\n[Site "Local"]\n[Date "2025.11.15"]\n[Round "2"]\n[White "C"]\n[Black "D"]\n[Result "0-1"]\n\n1. d4 Nf6 2. c4 e6 3. Nc3 Bb4 4. e3 O-O 5. Bd3 d5 6. Nf3 c5 7. O-O Nc6 8. a3 Bxc3 9. bxc3 dxc4 10. Bxc4 Qc7 11. Qe2 e5 12. d5 e4 13. dxc6 e5 14. Qxf3 Ng4 0-1\n"""
@@ -54,5 +52,26 @@ class TestBatchPGNConverter(unittest.TestCase):
         txt = open(os.path.join(out,'single.txt'),'r',encoding='utf-8').read().strip()
         self.assertTrue(len(txt.split()) > 5)
 
+    def test_parallel_matches_serial(self):
+        import concurrent.futures
+        from unittest.mock import patch
+        pools = []
+
+        class RecordingPool(concurrent.futures.ProcessPoolExecutor):
+            def __init__(self, *args, **kwargs):
+                pools.append(self)
+                super().__init__(*args, **kwargs)
+
+        serial = mod.batch_convert(self.input_dir, os.path.join(self.tmp, 'serial'), fmt='json')
+        with patch('concurrent.futures.ProcessPoolExecutor', RecordingPool):
+            parallel = mod.batch_convert(self.input_dir, os.path.join(self.tmp, 'parallel'), fmt='json', workers=2)
+        self.assertEqual(len(pools), 1)  # the pool really ran, not a second serial pass
+        self.assertEqual(serial['ok'], 2)
+        self.assertEqual(parallel['ok'], serial['ok'])
+        for name in ('single.json', 'multi.json'):
+            a = open(os.path.join(self.tmp, 'serial', name), 'r', encoding='utf-8').read()
+            b = open(os.path.join(self.tmp, 'parallel', name), 'r', encoding='utf-8').read()
+            self.assertEqual(a, b)
+
 if __name__ == '__main__':
     unittest.main()
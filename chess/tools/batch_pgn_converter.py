@@ -39,7 +39,7 @@ import sys
 import json
 import glob
 import argparse
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Iterator, Tuple
 
 try:
     import chess.pgn  # type: ignore
@@ -64,16 +64,14 @@ def summarize_game(game: "chess.pgn.Game") -> Dict[str, Any]:
     """
     headers = game.headers
     moves: List[str] = []
-    node = game
-    while node and node.variations:
-        node = node.variations[0]
+    # One board walked along the mainline; node.san() would replay from the root per move
+    board = game.board()
+    for move in game.mainline_moves():
         try:
-            moves.append(node.move.san())  # python-chess move SAN
+            moves.append(board.san(move))
         except Exception:
-            try:
-                moves.append(node.san())
-            except Exception:
-                moves.append("?")
+            moves.append("?")
+        board.push(move)
 
     return {
         "result": headers.get("Result", "*"),
@@ -84,15 +82,14 @@ def summarize_game(game: "chess.pgn.Game") -> Dict[str, Any]:
     }
 
 
-def _read_all_games(path: str) -> List["chess.pgn.Game"]:
-    games: List["chess.pgn.Game"] = []
+def _iter_games(path: str) -> Iterator["chess.pgn.Game"]:
+    """Yield games one at a time so only the current game tree is held in memory."""
     with open(path, "r", encoding="utf-8", errors="ignore") as f:
         while True:
             g = chess.pgn.read_game(f)
             if g is None:
                 break
-            games.append(g)
-    return games
+            yield g
 
 
 def convert_pgn_file(input_path: str, output_path: str, fmt: str = DEFAULT_FORMAT, force: bool = False, multi: bool = True) -> Dict[str, Any]:
@@ -128,12 +125,12 @@ def convert_pgn_file(input_path: str, output_path: str, fmt: str = DEFAULT_FORMA
         return report
 
     try:
-        games = _read_all_games(input_path) if multi else games  # if multi False, undefined; multi always True here
-        if not games:
+        # Each game tree is summarized and dropped before the next one is parsed
+        summaries = [summarize_game(g) for g in _iter_games(input_path)]
+        if not summaries:
             report["status"] = "error"
             report["error"] = "No games parsed (empty or invalid PGN)"
             return report
-        summaries = [summarize_game(g) for g in games]
         if fmt == "json":
             with open(output_path, "w", encoding="utf-8") as out:
                 json.dump(summaries if len(summaries) > 1 else summaries[0], out, separators=(",", ":"))
@@ -157,11 +154,12 @@ def convert_pgn_file(input_path: str, output_path: str, fmt: str = DEFAULT_FORMA
             with open(output_path, 'w', newline='', encoding='utf-8') as fcsv:
                 writer = csv.writer(fcsv)
                 writer.writerow(["game","ply","color","san","result","white","black"])
-                for gi, summary in enumerate(summaries, start=1):
-                    color = True
-                    for idx, san in enumerate(summary["moves"], start=1):
-                        writer.writerow([gi, idx, 'W' if color else 'B', san, summary['result'], summary['white'], summary['black']])
-                        color = not color
+                # One writerows() call per file instead of a writerow() per ply
+                writer.writerows(
+                    (gi, idx, 'W' if idx % 2 else 'B', san, summary['result'], summary['white'], summary['black'])
+                    for gi, summary in enumerate(summaries, start=1)
+                    for idx, san in enumerate(summary["moves"], start=1)
+                )
         elif fmt == "minimal":
             with open(output_path, "w", encoding="utf-8") as out:
                 for summary in summaries:
@@ -174,7 +172,25 @@ def convert_pgn_file(input_path: str, output_path: str, fmt: str = DEFAULT_FORMA
     return report
 
 
-def batch_convert(input_dir: str, output_dir: str, pattern: str = "*.pgn", fmt: str = DEFAULT_FORMAT, force: bool = False, aggregate_csv: bool = True) -> Dict[str, Any]:
+def _importable_by_name() -> bool:
+    """True if worker processes can import this module under its current name.
+
+    Pool workers look convert_pgn_file up by module name; a spawn-started worker
+    (Windows, macOS) cannot find a module that was only loaded from a file path.
+    """
+    if __name__ == "__main__":
+        return True  # run as a script: workers re-run the file as __mp_main__
+    try:
+        import importlib.machinery, importlib.util
+        if "." in __name__:
+            return importlib.util.find_spec(__name__) is not None
+        # PathFinder ignores sys.modules, so a module registered there by hand does not count
+        return importlib.machinery.PathFinder.find_spec(__name__) is not None
+    except Exception:
+        return False
+
+
+def batch_convert(input_dir: str, output_dir: str, pattern: str = "*.pgn", fmt: str = DEFAULT_FORMAT, force: bool = False, aggregate_csv: bool = True, workers: int = 1) -> Dict[str, Any]:
     """Batch convert PGN files from input_dir to output_dir.
 
     Parameters:
@@ -183,6 +199,9 @@ def batch_convert(input_dir: str, output_dir: str, pattern: str = "*.pgn", fmt:
         pattern: Glob pattern for PGN selection (default '*.pgn').
         fmt: Conversion format (json or summary).
         force: Overwrite existing outputs.
+        workers: Convert files in this many processes (1 = serial). Uses the pool
+            when run as a script or imported by name; a module loaded only from
+            a file path converts serially, since workers could not import it.
 
     Returns:
         Aggregate report dict: { 'total': int, 'ok': int, 'skipped': int, 'error': int, 'files': [file reports...] }
@@ -193,16 +212,24 @@ def batch_convert(input_dir: str, output_dir: str, pattern: str = "*.pgn", fmt:
     counts = {"ok": 0, "skipped": 0, "error": 0}
 
     aggregate_rows: List[Tuple] = []
-    for fpath in files:
-        base = os.path.splitext(os.path.basename(fpath))[0]
-        if fmt == 'json':
-            ext = 'json'
-        elif fmt == 'csv':
-            ext = 'csv'
-        else:
-            ext = 'txt'
-        out_path = os.path.join(output_dir, f"{base}.{ext}")
-        rep = convert_pgn_file(fpath, out_path, fmt=fmt, force=force, multi=True)
+    if fmt == 'json':
+        ext = 'json'
+    elif fmt == 'csv':
+        ext = 'csv'
+    else:
+        ext = 'txt'
+    bases = [os.path.splitext(os.path.basename(fpath))[0] for fpath in files]
+    out_paths = [os.path.join(output_dir, f"{base}.{ext}") for base in bases]
+    n = len(files)
+    if workers > 1 and n > 1 and _importable_by_name():
+        # Files are independent, so they convert in parallel; map() keeps input order
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(workers, n)) as pool:
+            file_reports = list(pool.map(convert_pgn_file, files, out_paths, [fmt] * n, [force] * n, [True] * n))
+    else:
+        file_reports = [convert_pgn_file(fpath, out_path, fmt=fmt, force=force, multi=True)
+                        for fpath, out_path in zip(files, out_paths)]
+    for base, out_path, rep in zip(bases, out_paths, file_reports):
         reports.append(rep)
         if rep["status"] in counts:
             counts[rep["status"]] += 1
@@ -214,12 +241,9 @@ def batch_convert(input_dir: str, output_dir: str, pattern: str = "*.pgn", fmt:
                 with open(out_path, 'r', encoding='utf-8') as fcsv:
                     reader = csv.reader(fcsv)
                     header = next(reader, [])
-                    for row in reader:
-                        if row and row[0].startswith('#'):
-                            continue
-                        # Expect columns: game, ply, color, san, result, white, black
-                        if len(row) == 7:
-                            aggregate_rows.append((base,)+tuple(row))
+                    # Expect columns: game, ply, color, san, result, white, black
+                    aggregate_rows.extend((base, *row) for row in reader
+                                          if len(row) == 7 and not row[0].startswith('#'))
             except Exception:
                 pass
 
@@ -231,8 +255,7 @@ def batch_convert(input_dir: str, output_dir: str, pattern: str = "*.pgn", fmt:
             with open(agg_path, 'w', newline='', encoding='utf-8') as fagg:
                 writer = csv.writer(fagg)
                 writer.writerow(["file","game","ply","color","san","result","white","black"])
-                for row in aggregate_rows:
-                    writer.writerow(row)
+                writer.writerows(aggregate_rows)
 
     return {
         "total": len(files),
@@ -250,12 +273,13 @@ def _parse_args(argv: List[str]) -> argparse.Namespace:
     parser.add_argument("--force", action="store_true", help="Overwrite existing outputs")
     parser.add_argument("--no-aggregate", action="store_true", help="Disable aggregate CSV output (csv format only)")
     parser.add_argument("--print-report", action="store_true", help="Print JSON report to stdout")
+    parser.add_argument("--workers", type=int, default=1, help="Convert files in this many processes")
     return parser.parse_args(argv)
 
 
 def main(argv: List[str] | None = None) -> int:
     args = _parse_args(argv or sys.argv[1:])
-    report = batch_convert(args.input, args.output, pattern=args.pattern, fmt=args.format, force=args.force, aggregate_csv=not args.no_aggregate)
+    report = batch_convert(args.input, args.output, pattern=args.pattern, fmt=args.format, force=args.force, aggregate_csv=not args.no_aggregate, workers=args.workers)
     if args.print_report:
         print(json.dumps(report, indent=2))
     else:
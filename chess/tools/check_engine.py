@@ -13,15 +13,18 @@ from typing import Optional
 import shutil
 import chess
 import chess.engine
+import urllib.error
 import urllib.request
 import json
 import zipfile
 import platform
 import tempfile
 import subprocess
+import threading
 import time
 
 DEFAULT_REPO_API = 'https://api.github.com/repos/official-stockfish/Stockfish/releases/latest'
+RELEASE_CACHE_NAME = '.release_cache.json'
 
 
 def find_default_engine():
@@ -47,51 +50,99 @@ def find_default_engine():
     return None
 
 
-def verify_engine(path: Optional[str], timeout: float) -> bool:
+def open_engine(path: Optional[str]):
+    """Start a UCI engine, or print the error and return None."""
     if not path:
         print('ERROR: no engine path provided', file=sys.stderr)
-        return False
+        return None
     try:
-        engine = chess.engine.SimpleEngine.popen_uci(path)
+        return chess.engine.SimpleEngine.popen_uci(path)
     except Exception as e:
         print(f'ERROR: failed to start engine: {e}', file=sys.stderr)
-        return False
+        return None
+
+
+def engine_alive(engine) -> bool:
     try:
-        board = chess.Board()
-        # request a very short play to check responsiveness
-        res = engine.play(board, chess.engine.Limit(time=timeout))
-        engine.quit()
-        if res is None or not getattr(res, 'move', None):
-            print('ERROR: engine did not return a move', file=sys.stderr)
+        engine.ping()
+        return True
+    except Exception:
+        return False
+
+
+def verify_engine(path: Optional[str], timeout: float, engine=None, deep: bool = False) -> bool:
+    """Check the engine answers isready, or a depth-1 search when deep is set.
+
+    engine: an already started SimpleEngine to reuse (left running); without
+    one, an engine is started from path and quit afterwards.
+    """
+    own = engine is None
+    if own:
+        engine = open_engine(path)
+        if engine is None:
             return False
-        # probe identity via separate subprocess UCI handshake
-        identity = probe_engine_identity(path)
+    try:
+        res = None
+        if deep:
+            # a real search, for engines that handshake fine but fail on 'go'
+            res = engine.play(chess.Board(), chess.engine.Limit(depth=1, time=timeout))
+            if res is None or not getattr(res, 'move', None):
+                print('ERROR: engine did not return a move', file=sys.stderr)
+                return False
+        else:
+            # isready/readyok is enough to show the process is alive and speaking UCI
+            engine.ping()
+        status = f'engine responded with move {res.move}' if res is not None else 'engine is ready'
+        # id name/author come from the handshake popen_uci already did; no second process
+        name = engine.id.get('name')
+        author = engine.id.get('author')
+        identity = ' '.join(([name] if name else []) + ([f'by {author}'] if author else []))
+        if not identity and path:
+            identity = probe_engine_identity(path)
         if identity:
-            print('OK: engine responded with move', res.move, '-', identity)
+            print('OK:', status, '-', identity)
         else:
-            print('OK: engine responded with move', res.move)
+            print('OK:', status)
         return True
     except Exception as e:
-        try:
-            engine.quit()
-        except Exception:
-            pass
-        print(f'ERROR during engine play: {e}', file=sys.stderr)
+        print(f'ERROR during engine verification: {e}', file=sys.stderr)
         return False
+    finally:
+        if own:
+            try:
+                engine.quit()
+            except Exception:
+                pass
 
 
 def probe_engine_identity(path: str) -> str:
+    proc = None
+    timer = None
     try:
-        proc = subprocess.Popen([path], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        out, err = proc.communicate('uci\nquit\n', timeout=5)
+        proc = subprocess.Popen([path], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                text=True, bufsize=1)
+        # Same 5 s worst case as before: a silent engine is killed, which ends the read loop
+        timer = threading.Timer(5, proc.kill)
+        timer.start()
+        proc.stdin.write('uci\n')
+        proc.stdin.flush()
         name = None
         author = None
-        for line in out.splitlines():
+        # The id lines come first; stop at uciok instead of buffering the whole option list
+        for line in proc.stdout:
             line = line.strip()
             if line.lower().startswith('id name'):
                 name = line[7:].strip()
             elif line.lower().startswith('id author'):
                 author = line[9:].strip()
+            elif line == 'uciok':
+                break
+        try:
+            proc.stdin.write('quit\n')
+            proc.stdin.close()
+            proc.wait(timeout=1)
+        except Exception:
+            proc.kill()
         parts = []
         if name:
             parts.append(name)
@@ -99,7 +150,50 @@ def probe_engine_identity(path: str) -> str:
             parts.append(f'by {author}')
         return ' '.join(parts)
     except Exception:
+        if proc is not None:
+            try:
+                proc.kill()
+            except Exception:
+                pass
         return ''
+    finally:
+        if timer is not None:
+            timer.cancel()
+
+
+def fetch_release_manifest(engines_dir: str, headers: dict):
+    """Latest-release JSON from the GitHub API, revalidated with the cached ETag.
+
+    Shares RELEASE_CACHE_NAME and its {'etag', 'json', 'ts'} layout with
+    EngineManager._fetch_release, so the GUI and this CLI revalidate one cache.
+    """
+    cache_path = os.path.join(engines_dir, RELEASE_CACHE_NAME)
+    cached = None
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except Exception:
+        cached = None
+    api_headers = dict(headers)
+    if isinstance(cached, dict) and cached.get('etag') and isinstance(cached.get('json'), dict):
+        api_headers['If-None-Match'] = cached['etag']
+    req = urllib.request.Request(DEFAULT_REPO_API, headers=api_headers)
+    try:
+        with urllib.request.urlopen(req, timeout=15) as resp:
+            data = json.load(resp)
+            etag = resp.headers.get('ETag')
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and 'If-None-Match' in api_headers:
+            return cached['json']
+        raise
+    if etag:
+        try:
+            os.makedirs(engines_dir, exist_ok=True)
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                json.dump({'etag': etag, 'json': data, 'ts': int(time.time())}, f)
+        except Exception:
+            pass
+    return data
 
 
 def download_stockfish(engines_dir: str, prefer_platform: str = 'auto', token: str = '') -> str:
@@ -111,9 +205,7 @@ def download_stockfish(engines_dir: str, prefer_platform: str = 'auto', token: s
     if token:
         headers['Authorization'] = f'token {token}'
     try:
-        req = urllib.request.Request(DEFAULT_REPO_API, headers=headers)
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            data = json.load(resp)
+        data = fetch_release_manifest(engines_dir, headers)
     except Exception as e:
         print('ERROR: could not query GitHub API:', e, file=sys.stderr)
         return ''
@@ -165,26 +257,21 @@ def download_stockfish(engines_dir: str, prefer_platform: str = 'auto', token: s
         req = urllib.request.Request(candidate, headers=headers)
         with urllib.request.urlopen(req, timeout=60) as resp, open(tmp_path, 'wb') as out:
             shutil.copyfileobj(resp, out)
-        with zipfile.ZipFile(tmp_path, 'r') as z:
-            z.extractall(engines_dir)
-        os.unlink(tmp_path)
         exe_name = 'stockfish'
         if sys.platform.startswith('win'):
             exe_name = 'stockfish.exe'
         found = ''
-        for root, dirs, files in os.walk(engines_dir):
-            for f in files:
-                if f.lower().startswith('stockfish'):
-                    candidate_path = os.path.join(root, f)
-                    dest = os.path.join(engines_dir, exe_name)
-                    try:
-                        shutil.copyfile(candidate_path, dest)
-                        found = dest
-                        break
-                    except Exception:
-                        continue
-            if found:
-                break
+        # Extract only the engine binary (the largest stockfish* file entry), not the docs and sources
+        with zipfile.ZipFile(tmp_path, 'r') as z:
+            entries = [i for i in z.infolist()
+                       if not i.is_dir() and os.path.basename(i.filename).lower().startswith('stockfish')]
+            if entries:
+                target = max(entries, key=lambda i: i.file_size)
+                dest = os.path.join(engines_dir, exe_name)
+                with z.open(target) as src, open(dest, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+                found = dest
+        os.unlink(tmp_path)
         if not found:
             print('ERROR: no executable found after extraction', file=sys.stderr)
             return ''
@@ -202,7 +289,8 @@ if __name__ == '__main__':
     p = argparse.ArgumentParser()
     p.add_argument('--path', '-p', help='Path to engine binary (Stockfish)')
     p.add_argument('--retries', '-r', type=int, default=2, help='Number of verification attempts')
-    p.add_argument('--timeout', '-t', type=float, default=0.05, help='Engine play time limit in seconds')
+    p.add_argument('--timeout', '-t', type=float, default=0.05, help='Time limit in seconds for the --deep search')
+    p.add_argument('--deep', action='store_true', help='Verify with a depth-1 search instead of only isready')
     p.add_argument('--download', action='store_true', help='Attempt to download Stockfish on first failed attempt')
     p.add_argument('--token', help='GitHub token (or set GITHUB_TOKEN env var) to increase API rate limit')
     p.add_argument('--platform', choices=['auto', 'windows', 'macos', 'linux'], default='auto', help='Preferred platform asset to download')
@@ -219,16 +307,26 @@ if __name__ == '__main__':
         print('Using engine:', path)
     last_err = None
     ok = False
+    # One engine process serves every attempt; it is restarted only if it died
+    engine = None
     for attempt in range(1, retries + 1):
         print(f'Attempt {attempt}/{retries}...')
         try:
-            ok = verify_engine(path, timeout)
+            if engine is None:
+                engine = open_engine(path)
+            ok = engine is not None and verify_engine(path, timeout, engine, deep=args.deep)
         except Exception as e:
             last_err = str(e)
             ok = False
         if ok:
             break
         else:
+            if engine is not None and not engine_alive(engine):
+                try:
+                    engine.close()
+                except Exception:
+                    pass
+                engine = None
             # small backoff
             time.sleep(0.5 * attempt)
             # if requested, try auto-download once
@@ -241,8 +339,19 @@ if __name__ == '__main__':
                 if found:
                     print('Downloaded engine to', found)
                     path = found
+                    if engine is not None:
+                        try:
+                            engine.quit()
+                        except Exception:
+                            pass
+                        engine = None
                 else:
                     print('Download attempt failed')
+    if engine is not None:
+        try:
+            engine.quit()
+        except Exception:
+            pass
     if not ok:
         print(f'Verification failed after {retries} attempts. Last error: {last_err}', file=sys.stderr)
     sys.exit(0 if ok else 1)
@@ -11,10 +11,22 @@ sys.path.insert(0, chess_dir)
 import unittest
 
 if __name__ == '__main__':
-    # Discover and run tests
+    # Load the test modules directly instead of discover(): no directory walk or
+    # pattern matching for this small, fixed set. New test modules must be listed here.
+    from tests import test_batch_converter, test_game_controller, test_metrics, test_special_moves
     loader = unittest.TestLoader()
-    start_dir = os.path.join(chess_dir, 'tests')
-    suite = loader.discover(start_dir, pattern='test_*.py')
+    suite = unittest.TestSuite()
+    for module in (test_batch_converter, test_game_controller, test_metrics, test_special_moves):
+        suite.addTests(loader.loadTestsFromModule(module))
+    
+    # --parallel forks the tests across CPUs when the optional concurrencytest
+    # package is installed; otherwise (and by default) they run serially
+    if '--parallel' in sys.argv[1:]:
+        try:
+            from concurrencytest import ConcurrentTestSuite, fork_for_tests
+            suite = ConcurrentTestSuite(suite, fork_for_tests(os.cpu_count() or 4))
+        except ImportError:
+            print('concurrencytest not installed; running tests serially', file=sys.stderr)
     
     runner = unittest.TextTestRunner(verbosity=2)
     result = runner.run(suite)